@@ -6,6 +6,8 @@ import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
 import ephem
+from scipy.stats import skew, kurtosis
+from joblib import Parallel, delayed
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 from sklearn.metrics import mean_squared_error, r2_score
@@ -16,7 +18,15 @@ class AdvancedTideAnalytics:
     def __init__(self):
         self.moon_phases = ['New Moon', 'Waxing Crescent', 'First Quarter', 'Waxing Gibbous',
                            'Full Moon', 'Waning Gibbous', 'Last Quarter', 'Waning Crescent']
+        self.seasons = ['Winter', 'Spring', 'Summer', 'Autumn']
+        # Index into self.seasons by month number (index 0 unused)
+        self.season_of_month = np.array([0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3, 0])
+        # Rows per block when computing lunar features (keeps the working set in L2)
+        self.lunar_chunk_rows = 1 << 18
         self.model = None
+        # Fitted IsolationForest reused while the anomaly features are unchanged
+        self._iso_forest = None
+        self._iso_forest_key = None
         
     def calculate_moon_phase(self, date):
         """Calculate moon phase for a given date"""
@@ -27,8 +37,10 @@ class AdvancedTideAnalytics:
         
         moon = ephem.Moon(observer)
         
-        # Calculate moon phase (0 = new moon, 0.5 = full moon)
-        phase = moon.moon_phase
+        # Calculate moon phase (0 = new moon, 0.5 = full moon) from the surrounding new moons
+        previous_new = ephem.previous_new_moon(observer.date)
+        next_new = ephem.next_new_moon(observer.date)
+        phase = (observer.date - previous_new) / (next_new - previous_new)
         
         # Convert to phase name
         phase_index = int((phase * 8) % 8)
@@ -37,41 +49,99 @@ class AdvancedTideAnalytics:
         return {
             'phase_value': phase,
             'phase_name': phase_name,
-            'illumination': phase,
+            'illumination': moon.moon_phase,
             'phase_angle': moon.phase
         }
     
-    def add_lunar_features(self, df):
-        """Add lunar-related features to dataframe"""
-        df_copy = df.copy()
+    def calculate_moon_phases(self, datetimes):
+        """Calculate synodic moon phase for an array of datetimes (vectorized)"""
+        # Julian Day from seconds since the Unix epoch
+        seconds = np.asarray(datetimes, dtype='datetime64[s]').astype('int64')
+        julian_day = seconds / 86400.0 + 2440587.5
         
-        # Calculate moon phases for each date
-        moon_data = []
-        for date in df_copy['datetime']:
-            moon_info = self.calculate_moon_phase(date)
-            moon_data.append(moon_info)
+        # Synodic phase (0 = new moon, 0.5 = full moon) relative to the 2000-01-06 new moon
+        phase = np.mod((julian_day - 2451550.1) / 29.530588853, 1.0)
+        illumination = 0.5 * (1 - np.cos(2 * np.pi * phase))
         
-        moon_df = pd.DataFrame(moon_data)
+        # Convert to phase names
+        phase_index = (phase * 8).astype(int) % 8
+        phase_names = np.array(self.moon_phases)[phase_index]
         
-        # Add lunar features
-        df_copy['moon_phase'] = moon_df['phase_value']
-        df_copy['moon_phase_name'] = moon_df['phase_name']
-        df_copy['moon_illumination'] = moon_df['illumination']
-        
-        # Add lunar tidal components
-        df_copy['lunar_distance_factor'] = np.sin(2 * np.pi * df_copy['day_of_year'] / 27.32)  # Lunar month
-        df_copy['solar_distance_factor'] = np.sin(2 * np.pi * df_copy['day_of_year'] / 365.25)  # Solar year
-        
-        # Spring/Neap tide indicator
-        df_copy['is_spring_tide'] = ((df_copy['moon_phase'] < 0.1) | (df_copy['moon_phase'] > 0.9) |
-                                    ((df_copy['moon_phase'] > 0.4) & (df_copy['moon_phase'] < 0.6)))
-        
-        return df_copy
+        return phase, phase_names, illumination
+    
+    def add_lunar_features(self, df, exact=False):
+        """Add lunar-related features to dataframe
+        
+        With exact=True the moon phase is computed with ephem for every row
+        (spread across processes) instead of the vectorized approximation.
+        """
+        n_rows = len(df)
+        datetimes = df['datetime'].values
+        day_of_year = df['day_of_year'].to_numpy()
+        
+        if exact:
+            moon_data = Parallel(n_jobs=-1, prefer='processes', batch_size='auto')(
+                delayed(self.calculate_moon_phase)(date) for date in df['datetime'].tolist()
+            )
+            moon_df = pd.DataFrame(moon_data)
+            phase = moon_df['phase_value'].to_numpy()
+            phase_names = moon_df['phase_name'].to_numpy()
+            illumination = moon_df['illumination'].to_numpy()
+        else:
+            phase = np.empty(n_rows)
+            phase_names = np.empty(n_rows, dtype=object)
+            illumination = np.empty(n_rows)
+        
+        lunar_distance_factor = np.empty(n_rows)
+        solar_distance_factor = np.empty(n_rows)
+        is_spring_tide = np.empty(n_rows, dtype=bool)
+        
+        # Work in cache-sized blocks so every feature is computed while a block's
+        # inputs are still resident, instead of one full pass per feature
+        for start in range(0, n_rows, self.lunar_chunk_rows):
+            block = slice(start, start + self.lunar_chunk_rows)
+            if not exact:
+                phase[block], phase_names[block], illumination[block] = \
+                    self.calculate_moon_phases(datetimes[block])
+            
+            # Lunar tidal components
+            block_days = day_of_year[block]
+            lunar_distance_factor[block] = np.sin(2 * np.pi * block_days / 27.32)  # Lunar month
+            solar_distance_factor[block] = np.sin(2 * np.pi * block_days / 365.25)  # Solar year
+            
+            # Spring tides fall within 0.1 of a new (0/1) or full (0.5) moon; folding the
+            # phase onto half a cycle turns the four comparisons into one in-place pass
+            syzygy_distance = np.multiply(phase[block], 2.0)
+            np.mod(syzygy_distance, 1.0, out=syzygy_distance)
+            syzygy_distance -= 0.5
+            np.abs(syzygy_distance, out=syzygy_distance)
+            is_spring_tide[block] = syzygy_distance > 0.3
+        
+        # Add lunar features; assign only allocates the new columns
+        return df.assign(
+            moon_phase=phase,
+            moon_phase_name=phase_names,
+            moon_illumination=illumination,
+            lunar_distance_factor=lunar_distance_factor,
+            solar_distance_factor=solar_distance_factor,
+            is_spring_tide=is_spring_tide,
+        )
+    
+    def _harmonic_design_matrix(self, time_hours, omega):
+        """Build the [1, cos(wt)..., sin(wt)...] design matrix for harmonic fitting"""
+        n_const = len(omega)
+        A = np.empty((len(time_hours), 1 + 2 * n_const))
+        A[:, 0] = 1.0
+        phases = np.outer(time_hours, omega)
+        np.cos(phases, out=A[:, 1:1 + n_const])
+        np.sin(phases, out=A[:, 1 + n_const:])
+        return A
     
     def harmonic_tide_prediction(self, df, prediction_hours=72):
         """Predict future tides using harmonic analysis"""
         # Extract harmonic components
-        time_hours = (df['datetime'] - df['datetime'].min()).dt.total_seconds() / 3600
+        datetime_ns = df['datetime'].to_numpy(dtype='datetime64[ns]').view('int64')
+        time_hours = (datetime_ns - datetime_ns.min()).astype(np.float64) * (1.0 / 3.6e12)
         heights = df['height'].values
         
         # Fit harmonic components (simplified tidal constituents)
@@ -84,32 +154,33 @@ class AdvancedTideAnalytics:
             'P1': {'period': 24.0659, 'amp': 0, 'phase': 0},  # Solar diurnal
         }
         
-        # Fit each constituent using least squares
-        for name, const in constituents.items():
-            omega = 2 * np.pi / const['period']
-            cos_component = np.cos(omega * time_hours)
-            sin_component = np.sin(omega * time_hours)
-            
-            # Fit amplitude and phase
-            A = np.column_stack([cos_component, sin_component])
-            coeffs = np.linalg.lstsq(A, heights, rcond=None)[0]
-            
-            const['amp'] = np.sqrt(coeffs[0]**2 + coeffs[1]**2)
-            const['phase'] = np.arctan2(coeffs[1], coeffs[0])
-        
-        # Generate predictions
+        # Fit all constituents jointly with a single least-squares solve
+        periods = np.array([const['period'] for const in constituents.values()])
+        omega = 2 * np.pi / periods
+        A = self._harmonic_design_matrix(time_hours, omega)
+        coeffs = np.linalg.lstsq(A, heights, rcond=None)[0]
+        
+        n_const = len(periods)
+        mean_height = coeffs[0]
+        cos_coeffs = coeffs[1:1 + n_const]
+        sin_coeffs = coeffs[1 + n_const:]
+        
+        # a*cos(wt) + b*sin(wt) == amp*cos(wt + phase)
+        amps = np.hypot(cos_coeffs, sin_coeffs)
+        phases = np.arctan2(-sin_coeffs, cos_coeffs)
+        for const, amp, phase in zip(constituents.values(), amps, phases):
+            const['amp'] = amp
+            const['phase'] = phase
+        
+        # Generate predictions: a single (M, k) buffer evaluated in place, then one GEMV
         future_times = np.arange(time_hours[-1], time_hours[-1] + prediction_hours, 0.25)
-        predictions = np.zeros(len(future_times))
-        
-        mean_height = np.mean(heights)
-        predictions += mean_height
-        
-        for name, const in constituents.items():
-            omega = 2 * np.pi / const['period']
-            predictions += const['amp'] * np.cos(omega * future_times + const['phase'])
+        angles = np.outer(future_times, omega)
+        angles += phases
+        np.cos(angles, out=angles)
+        predictions = angles @ amps + mean_height
         
         # Create prediction dataframe
-        future_datetimes = [df['datetime'].iloc[-1] + timedelta(hours=h) for h in future_times - time_hours[-1]]
+        future_datetimes = df['datetime'].iloc[-1] + pd.to_timedelta(future_times - time_hours[-1], unit='h')
         
         prediction_df = pd.DataFrame({
             'datetime': future_datetimes,
@@ -119,17 +190,61 @@ class AdvancedTideAnalytics:
         
         return prediction_df, constituents
     
+    def _pack_forest(self, estimators):
+        """Flatten fitted regression trees into shared node arrays for direct traversal"""
+        trees = [est.tree_ for est in estimators]
+        max_nodes = max(tree.node_count for tree in trees)
+        size = len(trees) * max_nodes
+        
+        feature = np.zeros(size, dtype=np.intp)
+        threshold = np.zeros(size)
+        left = np.zeros(size, dtype=np.intp)
+        right = np.zeros(size, dtype=np.intp)
+        value = np.zeros(size)
+        
+        for i, tree in enumerate(trees):
+            offset = i * max_nodes
+            nodes = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+            block = slice(offset, offset + tree.node_count)
+            feature[block] = np.maximum(tree.feature, 0)
+            threshold[block] = tree.threshold
+            # Leaves point at themselves so every tree can take max_depth steps
+            left[block] = np.where(is_leaf, nodes, tree.children_left) + offset
+            right[block] = np.where(is_leaf, nodes, tree.children_right) + offset
+            value[block] = tree.value[:, 0, 0]
+        
+        return {
+            'roots': np.arange(len(trees)) * max_nodes,
+            'feature': feature,
+            'threshold': threshold,
+            'left': left,
+            'right': right,
+            'value': value,
+            'max_depth': max(tree.max_depth for tree in trees)
+        }
+    
+    def _predict_packed_forest(self, forest, x):
+        """Average prediction of all trees for one float32 feature vector"""
+        node = forest['roots']
+        for _ in range(forest['max_depth']):
+            go_left = x[forest['feature'][node]] <= forest['threshold'][node]
+            node = np.where(go_left, forest['left'][node], forest['right'][node])
+        return forest['value'][node].mean()
+    
     def ml_tide_prediction(self, df, prediction_hours=72):
         """Predict future tides using machine learning"""
         # Prepare features
         df_ml = df.copy()
         
         # Add lag features
-        for lag in [1, 2, 3, 6, 12, 24]:
+        lags = [1, 2, 3, 6, 12, 24]
+        windows = [6, 12, 24]
+        for lag in lags:
             df_ml[f'height_lag_{lag}'] = df_ml['height'].shift(lag)
         
         # Add rolling statistics
-        for window in [6, 12, 24]:
+        for window in windows:
             df_ml[f'height_mean_{window}'] = df_ml['height'].rolling(window=window).mean()
             df_ml[f'height_std_{window}'] = df_ml['height'].rolling(window=window).std()
         
@@ -144,15 +259,24 @@ class AdvancedTideAnalytics:
                           col.startswith(('height_lag_', 'height_mean_', 'height_std_', 'hour_', 'day_')) or
                           col in ['month', 'hour', 'day_of_year']]
         
-        # Prepare training data
+        # Prepare training data (float32 is what the trees use internally)
         df_clean = df_ml.dropna()
-        X = df_clean[feature_columns]
-        y = df_clean['height']
+        X = df_clean[feature_columns].to_numpy(dtype=np.float32)
+        y = df_clean['height'].to_numpy(dtype=np.float32)
         
         # Train model
         X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
         
-        self.model = RandomForestRegressor(n_estimators=100, random_state=42, n_jobs=-1)
+        # Bounded depth/leaf size and half-sample bagging keep each tree small,
+        # which bounds model memory and the per-step walk in the forecast loop
+        self.model = RandomForestRegressor(
+            n_estimators=100,
+            max_depth=16,
+            min_samples_leaf=4,
+            max_samples=0.5,
+            random_state=42,
+            n_jobs=-1
+        )
         self.model.fit(X_train, y_train)
         
         # Evaluate model
@@ -161,39 +285,73 @@ class AdvancedTideAnalytics:
         r2 = r2_score(y_test, y_pred)
         
         # Make future predictions
-        last_row = df_clean.iloc[-1:].copy()
-        predictions = []
+        n_steps = int(prediction_hours * 4)  # 15-minute intervals
+        future_datetimes = df_clean['datetime'].iloc[-1] + pd.to_timedelta(
+            15 * np.arange(1, n_steps + 1), unit='min'
+        )
+        
+        # Precompute time features for every future step
+        future_hours = future_datetimes.hour.to_numpy()
+        future_days = future_datetimes.dayofyear.to_numpy()
+        future_time_features = {
+            'hour': future_hours,
+            'day_of_year': future_days,
+            'hour_sin': np.sin(2 * np.pi * future_hours / 24),
+            'hour_cos': np.cos(2 * np.pi * future_hours / 24),
+            'day_sin': np.sin(2 * np.pi * future_days / 365.25),
+            'day_cos': np.cos(2 * np.pi * future_days / 365.25),
+        }
+        future_time_features = {
+            feature_columns.index(col): values
+            for col, values in future_time_features.items() if col in feature_columns
+        }
         
-        for i in range(int(prediction_hours * 4)):  # 15-minute intervals
-            # Create features for next prediction
-            future_datetime = last_row['datetime'].iloc[0] + timedelta(minutes=15 * (i + 1))
-            
-            future_row = last_row.copy()
-            future_row['datetime'] = future_datetime
-            future_row['hour'] = future_datetime.hour
-            future_row['day_of_year'] = future_datetime.timetuple().tm_yday
-            
-            # Update time features
-            future_row['hour_sin'] = np.sin(2 * np.pi * future_row['hour'] / 24)
-            future_row['hour_cos'] = np.cos(2 * np.pi * future_row['hour'] / 24)
-            future_row['day_sin'] = np.sin(2 * np.pi * future_row['day_of_year'] / 365.25)
-            future_row['day_cos'] = np.cos(2 * np.pi * future_row['day_of_year'] / 365.25)
+        # Ring buffer of the most recent heights feeds the lag and rolling features;
+        # rolling mean/std are kept as running sums so each step is O(1)
+        buffer_size = max(lags + windows)
+        history = df_clean['height'].to_numpy(dtype=np.float64)[-buffer_size:].copy()
+        pos = 0  # slot holding the oldest height
+        lag_columns = [(feature_columns.index(f'height_lag_{lag}'), lag) for lag in lags]
+        window_columns = [
+            (feature_columns.index(f'height_mean_{w}'), feature_columns.index(f'height_std_{w}'), w)
+            for w in windows
+        ]
+        window_sums = {w: history[-w:].sum() for w in windows}
+        window_sq_sums = {w: np.square(history[-w:]).sum() for w in windows}
+        
+        # Single feature row updated in place; the forest is walked directly to
+        # skip the per-call validation and joblib dispatch of model.predict
+        x_row = X[-1:].copy()
+        forest = self._pack_forest(self.model.estimators_)
+        predictions = np.empty(n_steps)
+        
+        for i in range(n_steps):
+            for col_idx, values in future_time_features.items():
+                x_row[0, col_idx] = values[i]
+            for col_idx, lag in lag_columns:
+                x_row[0, col_idx] = history[(pos - lag) % buffer_size]
+            for mean_idx, std_idx, w in window_columns:
+                mean = window_sums[w] / w
+                var = max(window_sq_sums[w] - w * mean * mean, 0.0) / (w - 1)
+                x_row[0, mean_idx] = mean
+                x_row[0, std_idx] = np.sqrt(var)
             
-            # Predict
-            X_future = future_row[feature_columns]
-            pred_height = self.model.predict(X_future)[0]
+            pred_height = self._predict_packed_forest(forest, x_row[0])
+            predictions[i] = pred_height
             
-            predictions.append({
-                'datetime': future_datetime,
-                'predicted_height': pred_height,
-                'prediction_type': 'ml'
-            })
-            
-            # Update last_row for next iteration
-            future_row['height'] = pred_height
-            last_row = future_row
+            # Push the prediction into the history for the next step
+            for w in windows:
+                leaving = history[(pos - w) % buffer_size]
+                window_sums[w] += pred_height - leaving
+                window_sq_sums[w] += pred_height * pred_height - leaving * leaving
+            history[pos] = pred_height
+            pos = (pos + 1) % buffer_size
         
-        prediction_df = pd.DataFrame(predictions)
+        prediction_df = pd.DataFrame({
+            'datetime': future_datetimes,
+            'predicted_height': predictions,
+            'prediction_type': 'ml'
+        })
         
         model_metrics = {
             'mse': mse,
@@ -204,29 +362,73 @@ class AdvancedTideAnalytics:
         
         return prediction_df, model_metrics
     
+    def _centered_rolling_stats(self, values, window):
+        """Centered rolling mean and sample std using running sums (O(N) for any window)"""
+        x = np.asarray(values, dtype=np.float64)
+        n = len(x)
+        mean = np.full(n, np.nan)
+        std = np.full(n, np.nan)
+        missing = np.isnan(x)
+        if n < window or missing.all():
+            return mean, std
+        
+        # Shift by the global mean so the sum-of-squares stays well conditioned;
+        # missing values add nothing to the running sums
+        offset = np.nanmean(x)
+        centered = np.where(missing, 0.0, x - offset)
+        csum = np.concatenate(([0.0], np.cumsum(centered)))
+        csum_sq = np.concatenate(([0.0], np.cumsum(centered * centered)))
+        window_sum = csum[window:] - csum[:-window]
+        window_sum_sq = csum_sq[window:] - csum_sq[:-window]
+        
+        window_mean = window_sum / window
+        window_var = np.maximum(window_sum_sq - window_sum * window_mean, 0.0) / (window - 1)
+        
+        # Windows holding a missing value stay NaN, as with pandas rolling()
+        if missing.any():
+            nan_count = np.concatenate(([0], np.cumsum(missing)))
+            incomplete = nan_count[window:] != nan_count[:-window]
+            window_mean[incomplete] = np.nan
+            window_var[incomplete] = np.nan
+        
+        # Same alignment as pandas rolling(center=True)
+        start = window // 2
+        mean[start:start + len(window_mean)] = window_mean + offset
+        std[start:start + len(window_var)] = np.sqrt(window_var)
+        return mean, std
+    
     def tidal_anomaly_detection(self, df):
         """Detect anomalous tidal patterns"""
-        df_copy = df.copy()
-        
         # Calculate rolling statistics
         window = 24  # 24-hour window
-        df_copy['rolling_mean'] = df_copy['height'].rolling(window=window, center=True).mean()
-        df_copy['rolling_std'] = df_copy['height'].rolling(window=window, center=True).std()
+        rolling_mean, rolling_std = self._centered_rolling_stats(df['height'].to_numpy(), window)
         
-        # Z-score based anomaly detection
-        df_copy['z_score'] = np.abs((df_copy['height'] - df_copy['rolling_mean']) / df_copy['rolling_std'])
-        df_copy['is_anomaly'] = df_copy['z_score'] > 2.5
+        # Z-score based anomaly detection, evaluated in place in a single buffer
+        z_score = df['height'].to_numpy(dtype=np.float64) - rolling_mean
+        np.divide(z_score, rolling_std, out=z_score)
+        np.abs(z_score, out=z_score)
+        is_anomaly = z_score > 2.5
         
         # Isolation Forest for multivariate anomaly detection
         from sklearn.ensemble import IsolationForest
         
         features = ['height', 'hour', 'day_of_year', 'month']
-        iso_forest = IsolationForest(contamination=0.05, random_state=42)
-        df_copy['anomaly_score'] = iso_forest.fit_predict(df_copy[features])
-        df_copy['is_multivariate_anomaly'] = df_copy['anomaly_score'] == -1
-        
-        # Combine anomaly indicators
-        df_copy['combined_anomaly'] = df_copy['is_anomaly'] | df_copy['is_multivariate_anomaly']
+        X = df[features].to_numpy(dtype=np.float64)
+        cache_key = (X.shape, hash(X.tobytes()))
+        if self._iso_forest is None or self._iso_forest_key != cache_key:
+            self._iso_forest = IsolationForest(contamination=0.05, random_state=42, n_jobs=-1)
+            self._iso_forest.fit(X)
+            self._iso_forest_key = cache_key
+        anomaly_score = self._iso_forest.predict(X)
+        is_multivariate_anomaly = anomaly_score == -1
+        
+        # Combine anomaly indicators; assign only allocates the new columns
+        df_copy = df.assign(
+            is_anomaly=is_anomaly,
+            anomaly_score=anomaly_score,
+            is_multivariate_anomaly=is_multivariate_anomaly,
+            combined_anomaly=is_anomaly | is_multivariate_anomaly,
+        )
         
         anomaly_summary = {
             'total_anomalies': df_copy['combined_anomaly'].sum(),
@@ -236,37 +438,53 @@ class AdvancedTideAnalytics:
         
         return df_copy, anomaly_summary
     
+    def _quantiles(self, values, qs):
+        """Linear-interpolated quantiles via O(N) selection instead of a full sort"""
+        values = np.asarray(values, dtype=np.float64)
+        qs = np.asarray(qs, dtype=np.float64)
+        
+        # Missing values are skipped, and nothing left gives NaN, as Series.quantile does
+        values = values[~np.isnan(values)]
+        if len(values) == 0:
+            return np.full(qs.shape, np.nan)
+        
+        positions = qs * (len(values) - 1)
+        lower = np.floor(positions).astype(int)
+        upper = np.minimum(lower + 1, len(values) - 1)
+        selected = np.partition(values, np.unique(np.concatenate([lower, upper])))
+        frac = positions - lower
+        
+        # Interpolate from the nearer neighbour, as NumPy's (and so pandas') lerp does,
+        # so infinite values give the same results
+        low, high = selected[lower], selected[upper]
+        step = high - low
+        return np.where(frac < 0.5, low + step * frac, high - step * (1 - frac))
+    
+    def _season_counts(self, months):
+        """Count events per season with one bincount, most frequent first"""
+        counts = np.bincount(self.season_of_month[months], minlength=len(self.seasons))
+        order = np.argsort(-counts, kind='stable')
+        return {self.seasons[i]: int(counts[i]) for i in order if counts[i] > 0}
+    
     def tidal_extreme_analysis(self, df):
         """Analyze extreme tidal events"""
+        heights = df['height'].to_numpy(dtype=np.float64)
+        
         # Define extreme thresholds
-        height_95 = df['height'].quantile(0.95)
-        height_05 = df['height'].quantile(0.05)
-        
-        extreme_high = df[df['height'] >= height_95].copy()
-        extreme_low = df[df['height'] <= height_05].copy()
-        
-        # Analyze seasonal patterns of extremes
-        extreme_high['season'] = extreme_high['month'].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
-        })
+        height_05, height_95 = self._quantiles(heights, [0.05, 0.95])
         
-        extreme_low['season'] = extreme_low['month'].map({
-            12: 'Winter', 1: 'Winter', 2: 'Winter',
-            3: 'Spring', 4: 'Spring', 5: 'Spring',
-            6: 'Summer', 7: 'Summer', 8: 'Summer',
-            9: 'Autumn', 10: 'Autumn', 11: 'Autumn'
-        })
+        months = df['month'].to_numpy()
+        high_months = months[heights >= height_95]
+        low_months = months[heights <= height_05]
         
         extreme_analysis = {
             'high_threshold': height_95,
             'low_threshold': height_05,
-            'extreme_high_events': len(extreme_high),
-            'extreme_low_events': len(extreme_low),
-            'high_seasonal_dist': extreme_high['season'].value_counts().to_dict(),
-            'low_seasonal_dist': extreme_low['season'].value_counts().to_dict(),
+            'extreme_high_events': len(high_months),
+            'extreme_low_events': len(low_months),
+            # Analyze seasonal patterns of extremes
+            'high_seasonal_dist': self._season_counts(high_months),
+            'low_seasonal_dist': self._season_counts(low_months),
             'highest_event': {
                 'height': df['height'].max(),
                 'datetime': df.loc[df['height'].idxmax(), 'datetime']
@@ -279,43 +497,70 @@ class AdvancedTideAnalytics:
         
         return extreme_analysis
     
+    def _group_mean(self, keys, values):
+        """Mean of values per non-negative integer key, as a {key: mean} dict (NaNs skipped)"""
+        keys = np.asarray(keys, dtype=np.int64)
+        rows = np.bincount(keys)
+        present = np.flatnonzero(rows)
+        
+        # Missing values are left out of both sums and counts, as groupby().mean() does;
+        # a key with no values left keeps its entry as NaN
+        known = ~np.isnan(values)
+        sums = np.bincount(keys[known], weights=values[known], minlength=len(rows))
+        counts = np.bincount(keys[known], minlength=len(rows))
+        means = np.full(len(rows), np.nan)
+        np.divide(sums, counts, out=means, where=counts > 0)
+        return dict(zip(present.tolist(), means[present].tolist()))
+    
     def calculate_tidal_statistics(self, df):
         """Calculate comprehensive tidal statistics"""
         stats = {}
+        heights = df['height'].to_numpy(dtype=np.float64)
         
-        # Basic statistics
+        # Basic statistics (single height array, no per-call pandas dispatch);
+        # missing heights are skipped, as the Series reductions did
+        height_min = np.nanmin(heights)
+        height_max = np.nanmax(heights)
         stats['basic'] = {
-            'mean': df['height'].mean(),
-            'median': df['height'].median(),
-            'std': df['height'].std(),
-            'min': df['height'].min(),
-            'max': df['height'].max(),
-            'range': df['height'].max() - df['height'].min(),
-            'skewness': df['height'].skew(),
-            'kurtosis': df['height'].kurtosis()
+            'mean': np.nanmean(heights),
+            'median': np.nanmedian(heights),
+            'std': np.nanstd(heights, ddof=1),
+            'min': height_min,
+            'max': height_max,
+            'range': height_max - height_min,
+            'skewness': skew(heights, bias=False, nan_policy='omit'),
+            'kurtosis': kurtosis(heights, bias=False, nan_policy='omit')
         }
         
-        # Tidal cycle statistics
-        high_tides = df[df['tide_type'] == 'high']['height']
-        low_tides = df[df['tide_type'] == 'low']['height']
+        # Tidal cycle statistics (categorical tide_type compares integer codes)
+        tide_type = df['tide_type'].astype('category')
+        high_tides = heights[(tide_type == 'high').to_numpy()]
+        low_tides = heights[(tide_type == 'low').to_numpy()]
         
         if len(high_tides) > 0 and len(low_tides) > 0:
             stats['tidal_cycles'] = {
-                'avg_high_tide': high_tides.mean(),
-                'avg_low_tide': low_tides.mean(),
-                'avg_tidal_range': high_tides.mean() - low_tides.mean(),
-                'high_tide_std': high_tides.std(),
-                'low_tide_std': low_tides.std(),
+                'avg_high_tide': np.nanmean(high_tides),
+                'avg_low_tide': np.nanmean(low_tides),
+                'avg_tidal_range': np.nanmean(high_tides) - np.nanmean(low_tides),
+                'high_tide_std': np.nanstd(high_tides, ddof=1),
+                'low_tide_std': np.nanstd(low_tides, ddof=1),
                 'num_high_tides': len(high_tides),
                 'num_low_tides': len(low_tides)
             }
         
         # Temporal patterns
+        if 'is_weekend' in df.columns:
+            weekend = df['is_weekend'].to_numpy(dtype=bool)
+            weekend_avg = np.nanmean(heights[weekend]) if weekend.any() else np.nan
+            weekday_avg = np.nanmean(heights[~weekend]) if not weekend.all() else np.nan
+        else:
+            weekend_avg = weekday_avg = None
+        
         stats['temporal'] = {
-            'hourly_avg': df.groupby('hour')['height'].mean().to_dict(),
-            'monthly_avg': df.groupby('month')['height'].mean().to_dict(),
-            'weekend_avg': df[df['is_weekend']]['height'].mean() if 'is_weekend' in df.columns else None,
-            'weekday_avg': df[~df['is_weekend']]['height'].mean() if 'is_weekend' in df.columns else None
+            'hourly_avg': self._group_mean(df['hour'].to_numpy(), heights),
+            'monthly_avg': self._group_mean(df['month'].to_numpy(), heights),
+            'weekend_avg': weekend_avg,
+            'weekday_avg': weekday_avg
         }
         
         return stats
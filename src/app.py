@@ -6,6 +6,7 @@ Beautiful and interactive dashboard for Hong Kong tide data
 import streamlit as st
 import pandas as pd
 import numpy as np
+import plotly.io as pio
 from datetime import datetime, timedelta, date
 import warnings
 warnings.filterwarnings('ignore')
@@ -28,106 +29,123 @@ st.set_page_config(
 )
 
 # Custom CSS for ocean theme
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #0d1421 0%, #1e3a5f 50%, #2e5a8a 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        color: white;
-        text-align: center;
-        margin-bottom: 2rem;
-    }
-    
-    .metric-card {
-        background: linear-gradient(135deg, #1e2329 0%, #2a2e39 100%);
-        padding: 1.5rem;
-        border-radius: 10px;
-        border: 1px solid #4a90e2;
-        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        transition: transform 0.3s ease, box-shadow 0.3s ease;
-    }
-    
-    .metric-card:hover {
-        transform: translateY(-5px);
-        box-shadow: 0 8px 15px rgba(74, 144, 226, 0.3);
-    }
-    
-    .status-card-high {
-        border-left: 4px solid #e74c3c;
-        background: linear-gradient(135deg, #1e2329 0%, #2a2e39 100%);
-    }
-    
-    .status-card-low {
-        border-left: 4px solid #3498db;
-        background: linear-gradient(135deg, #1e2329 0%, #2a2e39 100%);
-    }
-    
-    .status-card-rising {
-        border-left: 4px solid #2ecc71;
-        background: linear-gradient(135deg, #1e2329 0%, #2a2e39 100%);
-    }
-    
-    .status-card-falling {
-        border-left: 4px solid #f39c12;
-        background: linear-gradient(135deg, #1e2329 0%, #2a2e39 100%);
-    }
+@st.cache_resource(show_spinner=False)
+def _load_ocean_css():
+    """Read the ocean theme stylesheet once per server process"""
+    css_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'static', 'ocean.css')
+    with open(css_path, encoding='utf-8') as f:
+        return f"<style>{f.read()}</style>"
+
+st.html(_load_ocean_css())
+
+@st.cache_resource(ttl=86400, show_spinner=False)
+def _load_processed_tide_data():
+    """Load and process tide data once, shared read-only by every session"""
+    processor = TideDataProcessor()
     
-    .wave-animation {
-        background: linear-gradient(45deg, #4a90e2, #67b7dc, #85c9f0, #4a90e2);
-        background-size: 400% 400%;
-        animation: wave 3s ease-in-out infinite;
-        height: 6px;
-        border-radius: 5px;
-        margin: 1rem 0;
-        box-shadow: 0 2px 10px rgba(74, 144, 226, 0.3);
-    }
+    # Load data
+    processor.load_data()
     
-    @keyframes wave {
-        0% { background-position: 0% 50%; }
-        25% { background-position: 100% 0%; }
-        50% { background-position: 100% 100%; }
-        75% { background-position: 0% 100%; }
-        100% { background-position: 0% 50%; }
-    }
+    # Process data
+    processor.detect_high_low_tides()
+    df = processor.add_tidal_features()
     
-    .floating-animation {
-        animation: float 6s ease-in-out infinite;
-    }
+    # Calendar date computed once, so filters compare datetime64 values
+    # instead of building Python date objects on every rerun
+    df['date'] = df['datetime'].dt.normalize().values.astype('datetime64[D]')
     
-    @keyframes float {
-        0%, 100% { transform: translateY(0px); }
-        50% { transform: translateY(-10px); }
-    }
+    # Compact dtypes: half-width heights, integer-coded tide types
+    df['height'] = df['height'].astype('float32')
+    df['tide_type'] = df['tide_type'].astype('category')
     
-    .pulse-animation {
-        animation: pulse 2s infinite;
-    }
+    # Aggregates are returned alongside the frame so reruns don't have to regroup;
+    # keeping DataFrames out of df.attrs spares pandas copying and comparing them
+    return df, _tide_aggregates(df)
+
+def _monthly_height_stats(df):
+    """Mean and standard deviation of height per month"""
+    return df.groupby('month')['height'].agg(['mean', 'std']).round(2)
+
+def _tide_aggregates(df):
+    """Per-month and per-day height aggregates for a tide frame, keyed by name"""
+    aggregates = {'daily_range': df.groupby('date')['height'].agg(['min', 'max'])}
+    if 'month' in df.columns:
+        aggregates['monthly_stats'] = _monthly_height_stats(df)
+    return aggregates
+
+# Sidebar, table and label options
+_LAYOUT_MODES = ("📊 Multi-View Dashboard", "🌊 Enhanced Wave Animation", "🕐 Tide Clock",
+                 "📅 Seasonal Heatmap", "🏔️ 3D Surface", "📊 Monthly Comparison",
+                 "📏 Range Analysis", "⚡ Real-time Gauge")
+_TIME_FILTERS = ("All", "Last 7 Days", "Last 30 Days", "This Month", "Custom")
+_TABLE_ROW_OPTIONS = (10, 25, 50, 100, 'All')
+_MONTH_NAMES = ('', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec')
+
+# Tide interpretation buckets by height above average (upper bounds are inclusive)
+_TIDE_DIFF_THRESHOLDS = np.array([-0.8, -0.3, 0.3, 0.8])
+_TIDE_STATUSES = np.array(["Exceptionally Low Tide", "Low Tide", "Mid Tide",
+                           "High Tide", "Exceptionally High Tide"])
+_TIDE_RECOMMENDATIONS = np.array(["Best for tide pool exploration", "Great for beach exploration",
+                                  "Moderate conditions", "Good for boating and swimming",
+                                  "Perfect for deep water activities"])
+_TIDE_ACTIVITY_LEVELS = np.array(["Minimal", "Low", "Moderate", "High", "Peak"])
+
+# Simplified moon phase by day of month (index 0 unused)
+_MOON_PHASES = np.full(32, "🌒 Waxing/Waning", dtype=object)
+_MOON_PHASES[[1, 2, 3, 28, 29, 30, 31]] = "🌑 New Moon (Spring Tide)"
+_MOON_PHASES[13:17] = "🌕 Full Moon (Spring Tide)"
+_MOON_PHASES[6:10] = "🌓 First Quarter"
+_MOON_PHASES[21:25] = "🌗 Last Quarter"
+_SPRING_TIDE_DAYS = np.array(["Spring" in phase for phase in _MOON_PHASES])
+
+def _tide_type_mask(tide_type, label):
+    """Boolean array of rows with the given tide type, compared on category codes"""
+    if isinstance(tide_type.dtype, pd.CategoricalDtype):
+        if label not in tide_type.cat.categories:
+            return np.zeros(len(tide_type), dtype=bool)
+        return tide_type.cat.codes.to_numpy() == tide_type.cat.categories.get_loc(label)
+    return (tide_type == label).to_numpy()
+
+def _frame_fingerprint(df):
+    """Cheap identity for a tide frame, used instead of hashing every row"""
+    if df.empty:
+        return (0,)
+    fingerprint = (len(df), df['datetime'].iloc[0], df['datetime'].iloc[-1])
+    if 'height' in df.columns:
+        heights = df['height'].to_numpy()
+        fingerprint += (float(heights.min()), float(heights.max()))
+    return fingerprint
+
+@st.cache_data(show_spinner=False, hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _filter_tide_data(df, start_date, end_date, min_height, max_height):
+    """Filter tide data by date and height range, cached per control selection
     
-    @keyframes pulse {
-        0% { box-shadow: 0 0 0 0 rgba(74, 144, 226, 0.7); }
-        70% { box-shadow: 0 0 0 10px rgba(74, 144, 226, 0); }
-        100% { box-shadow: 0 0 0 0 rgba(74, 144, 226, 0); }
-    }
+    Returns the filtered frame and its aggregates, or None for the aggregates
+    when no rows were dropped and the full frame's still apply.
+    """
+    heights = df['height'].to_numpy()
+    mask = (heights >= min_height) & (heights <= max_height)
     
-    .sidebar .sidebar-content {
-        background: linear-gradient(180deg, #0d1421 0%, #1e2329 100%);
-    }
+    # Date filter on int64 nanoseconds: [start 00:00, day after end 00:00)
+    if start_date is not None and end_date is not None:
+        t = df['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        lo = np.datetime64(start_date, 'D').astype('datetime64[ns]').view(np.int64)
+        hi = (np.datetime64(end_date, 'D') + np.timedelta64(1, 'D')).astype('datetime64[ns]').view(np.int64)
+        mask &= (t >= lo) & (t < hi)
     
-    .stSelectbox > div > div {
-        background: #1e2329;
-        color: white;
-    }
+    filtered = df.loc[mask]
     
-    .insight-box {
-        background: linear-gradient(135deg, #1e3a5f 0%, #2e5a8a 100%);
-        padding: 1rem;
-        border-radius: 8px;
-        border-left: 4px solid #4a90e2;
-        margin: 1rem 0;
-    }
-</style>
-""", unsafe_allow_html=True)
+    # The full frame's aggregates only hold if nothing was dropped
+    if len(filtered) == len(df):
+        return filtered, None
+    return filtered, _tide_aggregates(filtered)
+
+@st.cache_data(show_spinner=False, max_entries=64, hash_funcs={pd.DataFrame: _frame_fingerprint})
+def _cached_figure_json(method_name, *args, **kwargs):
+    """Build a TideVisualizer figure and cache its JSON per frame fingerprint and arguments"""
+    fig = getattr(TideVisualizer(), method_name)(*args, **kwargs)
+    return fig.to_json()
 
 class DynamicWaveApp:
     def __init__(self):
@@ -135,51 +153,27 @@ class DynamicWaveApp:
         self.visualizer = TideVisualizer()
         self.data = None
         self.processed_data = None
+        self.aggregates = {}
     
     def get_tide_interpretation(self, current_height, avg_height, height_change):
-        """Get meaningful interpretation of current tide conditions"""
+        """Get meaningful interpretation of current tide conditions
+        
+        Works for scalars as well as arrays of heights.
+        """
+        height_diff = np.asarray(current_height) - avg_height
+        bucket = np.searchsorted(_TIDE_DIFF_THRESHOLDS, height_diff)
+        
         interpretations = {
-            'status': '',
-            'recommendation': '',
-            'activity_level': ''
+            'status': _TIDE_STATUSES[bucket],
+            'recommendation': _TIDE_RECOMMENDATIONS[bucket],
+            'activity_level': _TIDE_ACTIVITY_LEVELS[bucket]
         }
         
-        height_diff = current_height - avg_height
-        
-        if height_diff > 0.8:
-            interpretations['status'] = "Exceptionally High Tide"
-            interpretations['recommendation'] = "Perfect for deep water activities"
-            interpretations['activity_level'] = "Peak"
-        elif height_diff > 0.3:
-            interpretations['status'] = "High Tide"
-            interpretations['recommendation'] = "Good for boating and swimming"
-            interpretations['activity_level'] = "High"
-        elif height_diff > -0.3:
-            interpretations['status'] = "Mid Tide"
-            interpretations['recommendation'] = "Moderate conditions"
-            interpretations['activity_level'] = "Moderate"
-        elif height_diff > -0.8:
-            interpretations['status'] = "Low Tide"
-            interpretations['recommendation'] = "Great for beach exploration"
-            interpretations['activity_level'] = "Low"
-        else:
-            interpretations['status'] = "Exceptionally Low Tide"
-            interpretations['recommendation'] = "Best for tide pool exploration"
-            interpretations['activity_level'] = "Minimal"
-        
         return interpretations
-        
-    @st.cache_data
-    def load_and_process_data(_self):
-        """Load and process tide data with caching"""
-        # Load data
-        _self.data = _self.processor.load_data()
-        
-        # Process data
-        _self.processed_data = _self.processor.detect_high_low_tides()
-        _self.processed_data = _self.processor.add_tidal_features()
-        
-        return _self.processed_data
+    
+    def get_figure(self, method_name, *args, **kwargs):
+        """Cached equivalent of calling the named TideVisualizer method"""
+        return pio.from_json(_cached_figure_json(method_name, *args, **kwargs))
     
     def render_header(self):
         """Render main header"""
@@ -198,8 +192,8 @@ class DynamicWaveApp:
         
         # Date range selector
         if self.processed_data is not None:
-            min_date = self.processed_data['datetime'].dt.date.min()
-            max_date = self.processed_data['datetime'].dt.date.max()
+            min_date = self.processed_data['date'].min().date()
+            max_date = self.processed_data['date'].max().date()
             
             date_range = st.sidebar.date_input(
                 "Select Date Range",
@@ -212,9 +206,7 @@ class DynamicWaveApp:
             # Dashboard layout options
             layout_mode = st.sidebar.selectbox(
                 "Dashboard Layout",
-                ["📊 Multi-View Dashboard", "🌊 Enhanced Wave Animation", "🕐 Tide Clock", 
-                 "📅 Seasonal Heatmap", "🏔️ 3D Surface", "📊 Monthly Comparison",
-                 "📏 Range Analysis", "⚡ Real-time Gauge"],
+                _LAYOUT_MODES,
                 key="layout_mode"
             )
             
@@ -240,7 +232,7 @@ class DynamicWaveApp:
             # Time period filter
             time_filter = st.sidebar.selectbox(
                 "Time Period",
-                ["All", "Last 7 Days", "Last 30 Days", "This Month", "Custom"],
+                _TIME_FILTERS,
                 key="time_filter"
             )
             
@@ -266,46 +258,39 @@ class DynamicWaveApp:
         return None
     
     def filter_data(self, controls):
-        """Filter data based on controls"""
+        """Filter data based on controls, returning the frame and its aggregates"""
         if controls is None or self.processed_data is None:
-            return self.processed_data
+            return self.processed_data, self.aggregates
         
-        filtered_data = self.processed_data.copy()
-        
-        # Date filter
+        start_date = end_date = None
         if len(controls['date_range']) == 2:
             start_date, end_date = controls['date_range']
-            filtered_data = filtered_data[
-                (filtered_data['datetime'].dt.date >= start_date) &
-                (filtered_data['datetime'].dt.date <= end_date)
-            ]
         
-        # Height filter
         min_height, max_height = controls['height_range']
-        filtered_data = filtered_data[
-            (filtered_data['height'] >= min_height) &
-            (filtered_data['height'] <= max_height)
-        ]
-        
-        return filtered_data
+        filtered, aggregates = _filter_tide_data(self.processed_data, start_date, end_date, min_height, max_height)
+        return filtered, self.aggregates if aggregates is None else aggregates
     
-    def render_metrics(self, data):
+    @st.fragment
+    def render_metrics(self, data, aggregates=None):
         """Render meaningful and dynamic key metrics"""
         if data is None or data.empty:
             return
         
+        # Pull the underlying arrays once; scalar lookups below avoid pandas indexers
+        h = data['height'].to_numpy()
+        
         # Calculate meaningful metrics
-        current_height = data['height'].iloc[-1]
-        previous_height = data['height'].iloc[-2] if len(data) > 1 else current_height
+        current_height = h[-1]
+        previous_height = h[-2] if len(h) > 1 else current_height
         height_change = current_height - previous_height
         
         # Determine tide status
-        high_tides = data[data['tide_type'] == 'high']['height'] if 'tide_type' in data.columns else []
-        low_tides = data[data['tide_type'] == 'low']['height'] if 'tide_type' in data.columns else []
+        high_tides = h[_tide_type_mask(data['tide_type'], 'high')] if 'tide_type' in data.columns else []
+        low_tides = h[_tide_type_mask(data['tide_type'], 'low')] if 'tide_type' in data.columns else []
         
         # Get current tide phase
-        current_time = data['datetime'].iloc[-1]
-        avg_height = data['height'].mean()
+        current_time = pd.Timestamp(data['datetime'].to_numpy()[-1])
+        avg_height = np.nanmean(h)  # missing heights skipped, as Series.mean() did
         
         if current_height > avg_height + 0.5:
             tide_status = "High Tide"
@@ -321,107 +306,72 @@ class DynamicWaveApp:
             tide_emoji = "📉"
         
         # Calculate next tide prediction
+        time_to_event = "Calculating..."
         if len(high_tides) > 0 and len(low_tides) > 0:
-            next_high = high_tides.max()
-            next_low = low_tides.min()
+            next_high = np.nanmax(high_tides)
+            next_low = np.nanmin(low_tides)
             if current_height < avg_height:
-                time_to_high = "~2-4 hours"
+                time_to_event = "~2-4 hours"
                 next_event = f"High: {next_high:.2f}m"
             else:
-                time_to_low = "~3-5 hours"
+                time_to_event = "~3-5 hours"
                 next_event = f"Low: {next_low:.2f}m"
         else:
             next_event = "Calculating..."
         
         # Calculate tidal energy (rate of change)
-        if len(data) >= 6:
-            recent_changes = data['height'].diff().tail(6)
-            tidal_energy = abs(recent_changes.mean()) * 100
+        if len(h) >= 6:
+            # Last six changes (five when only six samples exist)
+            recent_changes = np.diff(h[-7:])
+            tidal_energy = abs(np.nanmean(recent_changes)) * 100
             energy_status = "High" if tidal_energy > 0.1 else "Moderate" if tidal_energy > 0.05 else "Low"
         else:
             tidal_energy = 0
             energy_status = "Low"
         
         # Moon phase influence (simplified)
-        day_of_month = current_time.day
-        moon_phase = ""
-        if 1 <= day_of_month <= 3 or 28 <= day_of_month <= 31:
-            moon_phase = "🌑 New Moon (Spring Tide)"
-        elif 13 <= day_of_month <= 16:
-            moon_phase = "🌕 Full Moon (Spring Tide)"
-        elif 6 <= day_of_month <= 9:
-            moon_phase = "🌓 First Quarter"
-        elif 21 <= day_of_month <= 24:
-            moon_phase = "🌗 Last Quarter"
-        else:
-            moon_phase = "🌒 Waxing/Waning"
+        moon_phase = _MOON_PHASES[current_time.day]
         
         # Today's tidal range
-        today_data = data[data['datetime'].dt.date == current_time.date()]
-        if not today_data.empty:
-            today_range = today_data['height'].max() - today_data['height'].min()
-            yesterday_data = data[data['datetime'].dt.date == (current_time.date() - pd.Timedelta(days=1))]
-            if not yesterday_data.empty:
-                yesterday_range = yesterday_data['height'].max() - yesterday_data['height'].min()
-                range_change = today_range - yesterday_range
+        daily_range = (aggregates or {}).get('daily_range')
+        if daily_range is None:
+            daily_range = data.groupby('date')['height'].agg(['min', 'max'])
+        
+        today = pd.Timestamp(current_time.date())
+        yesterday = today - pd.Timedelta(days=1)
+        if today in daily_range.index:
+            today_min, today_max = daily_range.loc[today]
+            today_range = today_max - today_min
+            if yesterday in daily_range.index:
+                yesterday_min, yesterday_max = daily_range.loc[yesterday]
+                range_change = today_range - (yesterday_max - yesterday_min)
             else:
                 range_change = 0
         else:
-            today_range = data['height'].max() - data['height'].min()
+            today_range = np.nanmax(h) - np.nanmin(h)
             range_change = 0
         
-        col1, col2, col3, col4, col5 = st.columns(5)
+        metrics = [
+            (f"{tide_emoji} Current Status", f"{current_height:.2f}m",
+             f"{tide_status} ({height_change:+.2f}m)", "normal"),
+            ("� Next Tide Event", next_event, time_to_event, "off"),
+            ("⚡ Tidal Energy", f"{energy_status}", f"{tidal_energy:.2f}% change rate",
+             "normal" if energy_status == "High" else "off"),
+            ("🌙 Lunar Influence",
+             moon_phase.split()[1] if len(moon_phase.split()) > 1 else "Phase",
+             moon_phase.split("(")[1].replace(")", "") if "(" in moon_phase else "Normal Tide",
+             "normal" if "Spring" in moon_phase else "off"),
+            ("📏 Today's Range", f"{today_range:.2f}m",
+             f"{range_change:+.2f}m vs yesterday" if range_change != 0 else "First day data",
+             "normal" if range_change > 0 else "inverse" if range_change < 0 else "off"),
+        ]
         
-        with col1:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric(
-                label=f"{tide_emoji} Current Status", 
-                value=f"{current_height:.2f}m",
-                delta=f"{tide_status} ({height_change:+.2f}m)",
-                delta_color="normal"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        with col2:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric(
-                label="� Next Tide Event", 
-                value=next_event,
-                delta=time_to_high if 'time_to_high' in locals() else time_to_low if 'time_to_low' in locals() else "Calculating...",
-                delta_color="off"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        with col3:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric(
-                label="⚡ Tidal Energy", 
-                value=f"{energy_status}",
-                delta=f"{tidal_energy:.2f}% change rate",
-                delta_color="normal" if energy_status == "High" else "off"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        with col4:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric(
-                label="🌙 Lunar Influence", 
-                value=moon_phase.split()[1] if len(moon_phase.split()) > 1 else "Phase",
-                delta=moon_phase.split("(")[1].replace(")", "") if "(" in moon_phase else "Normal Tide",
-                delta_color="normal" if "Spring" in moon_phase else "off"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
-            
-        with col5:
-            st.markdown('<div class="metric-card">', unsafe_allow_html=True)
-            st.metric(
-                label="📏 Today's Range", 
-                value=f"{today_range:.2f}m",
-                delta=f"{range_change:+.2f}m vs yesterday" if range_change != 0 else "First day data",
-                delta_color="normal" if range_change > 0 else "inverse" if range_change < 0 else "off"
-            )
-            st.markdown('</div>', unsafe_allow_html=True)
+        with st.container():
+            cols = st.columns(len(metrics))
+            for col, (label, value, delta, delta_color) in zip(cols, metrics):
+                col.metric(label=label, value=value, delta=delta, delta_color=delta_color)
     
+    @st.fragment
     def render_visualization(self, layout_mode, multi_view_options, data):
         """Render selected visualization or multi-view dashboard"""
         if data is None or data.empty:
@@ -432,39 +382,39 @@ class DynamicWaveApp:
             self.render_multi_view_dashboard(multi_view_options, data)
             
         elif layout_mode == "🌊 Enhanced Wave Animation":
-            fig = self.visualizer.create_wave_animation(data, enhanced=True)
+            fig = self.get_figure('create_wave_animation', data, enhanced=True)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "🕐 Tide Clock":
             selected_date = st.date_input(
                 "Select Date for Tide Clock",
-                value=data['datetime'].dt.date.iloc[0],
-                min_value=data['datetime'].dt.date.min(),
-                max_value=data['datetime'].dt.date.max()
+                value=data['date'].iloc[0].date(),
+                min_value=data['date'].min().date(),
+                max_value=data['date'].max().date()
             )
-            fig = self.visualizer.create_circular_tide_clock(data, selected_date)
+            fig = self.get_figure('create_circular_tide_clock', data, selected_date)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "📅 Seasonal Heatmap":
-            fig = self.visualizer.create_seasonal_heatmap(data)
+            fig = self.get_figure('create_seasonal_heatmap', data)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "🏔️ 3D Surface":
-            fig = self.visualizer.create_3d_tide_surface(data)
+            fig = self.get_figure('create_3d_tide_surface', data)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "📊 Monthly Comparison":
-            fig = self.visualizer.create_monthly_comparison(data)
+            fig = self.get_figure('create_monthly_comparison', data)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "📏 Range Analysis":
-            fig = self.visualizer.create_tide_range_analysis(data)
+            fig = self.get_figure('create_tide_range_analysis', data)
             st.plotly_chart(fig, width='stretch')
             
         elif layout_mode == "⚡ Real-time Gauge":
             current_height = data['height'].iloc[-1]
             max_height = data['height'].max()
-            fig = self.visualizer.create_real_time_gauge(current_height, max_height)
+            fig = self.get_figure('create_real_time_gauge', current_height, max_height)
             st.plotly_chart(fig, width='stretch')
     
     def render_multi_view_dashboard(self, options, data):
@@ -479,10 +429,18 @@ class DynamicWaveApp:
             st.info("Please select at least one visualization from the sidebar")
             return
         
+        # Values shared by every view, computed once per render
+        h = data['height'].to_numpy()
+        ctx = {
+            'current_height': h[-1],
+            'max_height': h.max(),
+            'selected_date': data['date'].iloc[0].date()
+        }
+        
         # Main wave animation (always full width if selected)
         if options.get('wave', False):
             st.markdown("### 🌊 Enhanced Wave Animation")
-            fig = self.visualizer.create_wave_animation(data, enhanced=True, height=500)
+            fig = self.get_figure('create_wave_animation', data, enhanced=True, height=500)
             st.plotly_chart(fig, width='stretch')
             st.markdown("---")
         
@@ -494,83 +452,77 @@ class DynamicWaveApp:
             view = remaining_views[0]
             if view == 'gauge':
                 st.markdown("### ⚡ Real-time Tide Gauge")
-                current_height = data['height'].iloc[-1]
-                max_height = data['height'].max()
-                fig = self.visualizer.create_real_time_gauge(current_height, max_height)
+                fig = self.get_figure('create_real_time_gauge', ctx['current_height'], ctx['max_height'])
                 st.plotly_chart(fig, width='stretch')
             elif view == 'clock':
                 st.markdown("### 🕐 Daily Tide Clock")
-                selected_date = data['datetime'].dt.date.iloc[0]
-                fig = self.visualizer.create_circular_tide_clock(data, selected_date)
+                fig = self.get_figure('create_circular_tide_clock', data, ctx['selected_date'])
                 st.plotly_chart(fig, width='stretch')
             elif view == 'monthly':
                 st.markdown("### 📊 Monthly Comparison")
-                fig = self.visualizer.create_monthly_comparison(data)
+                fig = self.get_figure('create_monthly_comparison', data)
                 st.plotly_chart(fig, width='stretch')
             elif view == 'heatmap':
                 st.markdown("### 📅 Seasonal Heatmap")
-                fig = self.visualizer.create_seasonal_heatmap(data)
+                fig = self.get_figure('create_seasonal_heatmap', data)
                 st.plotly_chart(fig, width='stretch')
         
         elif len(remaining_views) == 2:
             # Two views side by side
             col1, col2 = st.columns(2)
             with col1:
-                self.render_single_view(remaining_views[0], data)
+                self.render_single_view(remaining_views[0], data, ctx)
             with col2:
-                self.render_single_view(remaining_views[1], data)
+                self.render_single_view(remaining_views[1], data, ctx)
         
         elif len(remaining_views) == 3:
             # Three views: one full width, two below
-            self.render_single_view(remaining_views[0], data)
+            self.render_single_view(remaining_views[0], data, ctx)
             col1, col2 = st.columns(2)
             with col1:
-                self.render_single_view(remaining_views[1], data)
+                self.render_single_view(remaining_views[1], data, ctx)
             with col2:
-                self.render_single_view(remaining_views[2], data)
+                self.render_single_view(remaining_views[2], data, ctx)
         
         elif len(remaining_views) >= 4:
             # Four views in 2x2 grid
             col1, col2 = st.columns(2)
             with col1:
-                self.render_single_view(remaining_views[0], data)
+                self.render_single_view(remaining_views[0], data, ctx)
                 if len(remaining_views) > 2:
-                    self.render_single_view(remaining_views[2], data)
+                    self.render_single_view(remaining_views[2], data, ctx)
             with col2:
-                self.render_single_view(remaining_views[1], data)
+                self.render_single_view(remaining_views[1], data, ctx)
                 if len(remaining_views) > 3:
-                    self.render_single_view(remaining_views[3], data)
+                    self.render_single_view(remaining_views[3], data, ctx)
     
-    def render_single_view(self, view_type, data):
+    def render_single_view(self, view_type, data, ctx):
         """Render a single view component"""
         if view_type == 'gauge':
             st.markdown("#### ⚡ Real-time Gauge")
-            current_height = data['height'].iloc[-1]
-            max_height = data['height'].max()
-            fig = self.visualizer.create_real_time_gauge(current_height, max_height)
+            fig = self.get_figure('create_real_time_gauge', ctx['current_height'], ctx['max_height'])
             fig.update_layout(height=300)
             st.plotly_chart(fig, width='stretch')
             
         elif view_type == 'clock':
             st.markdown("#### 🕐 Tide Clock")
-            selected_date = data['datetime'].dt.date.iloc[0]
-            fig = self.visualizer.create_circular_tide_clock(data, selected_date)
+            fig = self.get_figure('create_circular_tide_clock', data, ctx['selected_date'])
             fig.update_layout(height=350)
             st.plotly_chart(fig, width='stretch')
             
         elif view_type == 'monthly':
             st.markdown("#### 📊 Monthly Stats")
-            fig = self.visualizer.create_monthly_comparison(data)
+            fig = self.get_figure('create_monthly_comparison', data)
             fig.update_layout(height=350)
             st.plotly_chart(fig, width='stretch')
             
         elif view_type == 'heatmap':
             st.markdown("#### 📅 Mini Heatmap")
-            fig = self.visualizer.create_seasonal_heatmap(data)
+            fig = self.get_figure('create_seasonal_heatmap', data)
             fig.update_layout(height=300)
             st.plotly_chart(fig, width='stretch')
     
-    def render_insights(self, data):
+    def render_insights(self, data, aggregates=None):
         """Render data insights"""
         if data is None or data.empty:
             return
@@ -601,8 +553,8 @@ class DynamicWaveApp:
             """)
             
             # High/low tide statistics
-            high_tides = data[data['tide_type'] == 'high'] if 'tide_type' in data.columns else pd.DataFrame()
-            low_tides = data[data['tide_type'] == 'low'] if 'tide_type' in data.columns else pd.DataFrame()
+            high_tides = data[_tide_type_mask(data['tide_type'], 'high')] if 'tide_type' in data.columns else pd.DataFrame()
+            low_tides = data[_tide_type_mask(data['tide_type'], 'low')] if 'tide_type' in data.columns else pd.DataFrame()
             
             if not high_tides.empty and not low_tides.empty:
                 st.write(f"**High Tides:** {len(high_tides)} occurrences, avg: {high_tides['height'].mean():.2f}m")
@@ -620,9 +572,8 @@ class DynamicWaveApp:
             
             # Tidal range analysis
             current_time = data['datetime'].iloc[-1] if not data.empty else datetime.now()
-            day_of_month = current_time.day
             
-            if 1 <= day_of_month <= 3 or 28 <= day_of_month <= 31 or 13 <= day_of_month <= 16:
+            if _SPRING_TIDE_DAYS[current_time.day]:
                 tide_type = "Spring Tide Period"
                 tide_desc = "Expect larger tidal ranges"
             else:
@@ -638,12 +589,13 @@ class DynamicWaveApp:
             
             # Monthly statistics
             if 'month' in data.columns:
-                monthly_stats = data.groupby('month')['height'].agg(['mean', 'std']).round(2)
+                monthly_stats = (aggregates or {}).get('monthly_stats')
+                if monthly_stats is None:
+                    monthly_stats = _monthly_height_stats(data)
                 highest_month = monthly_stats['mean'].idxmax()
-                month_names = ['', 'Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
-                              'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-                st.write(f"**Highest avg month:** {month_names[highest_month]} ({monthly_stats.loc[highest_month, 'mean']:.2f}m)")
+                st.write(f"**Highest avg month:** {_MONTH_NAMES[highest_month]} ({monthly_stats.loc[highest_month, 'mean']:.2f}m)")
     
+    @st.fragment
     def render_data_table(self, data):
         """Render data table"""
         if data is None or data.empty:
@@ -664,7 +616,7 @@ class DynamicWaveApp:
         with col2:
             rows_to_show = st.selectbox(
                 "Rows to Display",
-                [10, 25, 50, 100, 'All'],
+                _TABLE_ROW_OPTIONS,
                 index=1,
                 key="table_rows"
             )
@@ -685,14 +637,23 @@ class DynamicWaveApp:
         
         st.dataframe(display_data, use_container_width=True)
         
-        # Download button
-        csv = display_data.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Data as CSV",
-            data=csv,
-            file_name=f"hk_tide_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-            mime="text/csv"
-        )
+        # Download button, CSV encoded only on request and reused until the table changes
+        csv_key = (_frame_fingerprint(data), tuple(show_columns), rows_to_show, sort_by)
+        if st.session_state.get('csv_key') != csv_key:
+            st.session_state.pop('csv_bytes', None)
+        
+        if 'csv_bytes' not in st.session_state:
+            if st.button("📄 Prepare CSV", key="prepare_csv"):
+                st.session_state['csv_key'] = csv_key
+                st.session_state['csv_bytes'] = display_data.to_csv(index=False).encode()
+        
+        if 'csv_bytes' in st.session_state:
+            st.download_button(
+                label="📥 Download Data as CSV",
+                data=st.session_state['csv_bytes'],
+                file_name=f"hk_tide_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+                mime="text/csv"
+            )
     
     def run(self):
         """Main application entry point"""
@@ -701,7 +662,8 @@ class DynamicWaveApp:
         
         # Load data
         with st.spinner("🌊 Loading tide data..."):
-            self.processed_data = self.load_and_process_data()
+            self.processed_data, self.aggregates = _load_processed_tide_data()
+            self.processor.processed_df = self.processed_data
         
         if self.processed_data is None or self.processed_data.empty:
             st.error("Failed to load tide data. Please check your connection.")
@@ -711,10 +673,10 @@ class DynamicWaveApp:
         controls = self.render_sidebar()
         
         # Filter data
-        filtered_data = self.filter_data(controls)
+        filtered_data, aggregates = self.filter_data(controls)
         
         # Render metrics
-        self.render_metrics(filtered_data)
+        self.render_metrics(filtered_data, aggregates)
         
         # Main content tabs
         tab1, tab2, tab3, tab4 = st.tabs(["📊 Visualizations", "🔍 Analytics", "📋 Data", "ℹ️ About"])
@@ -730,7 +692,7 @@ class DynamicWaveApp:
                 st.info("Please wait while data loads...")
         
         with tab2:
-            self.render_insights(filtered_data)
+            self.render_insights(filtered_data, aggregates)
             
             # Additional analytics
             if st.button("🔬 Run Advanced Analysis"):
@@ -6,7 +6,11 @@ Handles cleaning, transformation, and feature engineering
 import pandas as pd
 import numpy as np
 from scipy import signal
-from scipy.fft import fft, fftfreq
+from scipy.fft import rfft, rfftfreq
+from scipy.interpolate import CubicSpline
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 import warnings
 warnings.filterwarnings('ignore')
 
@@ -14,10 +18,38 @@ class TideDataProcessor:
     def __init__(self):
         self.df = None
         self.processed_df = None
+        self._stats = None
+        
+        # Output directory for saved datasets
+        self._data_dir = Path('data')
+        
+        # Series at least this long search highs and lows on two threads
+        self.parallel_extrema_min_size = 1 << 16
+        
+        # Angular frequency (radians per day) of the annual cycle; the hourly
+        # features scale 2*pi*time_decimal by the reciprocal period (in hours)
+        self.annual_omega = 2 * np.pi / 365.25
+        self.daily_inv_period = 1 / 24
+        self.constituent_inv_periods = {
+            'M2': 1 / 12.42,  # Principal lunar semi-diurnal
+            'S2': 1 / 12.00,  # Principal solar semi-diurnal
+            'K1': 1 / 23.93,  # Lunar diurnal
+            'O1': 1 / 25.82   # Lunar diurnal
+        }
+        
+        # Season name per month number (index 0 unused)
+        self.seasons = ['spring', 'summer', 'autumn', 'winter']
+        self.season_of_month = np.array(['', 'winter', 'winter', 'spring', 'spring', 'spring', 'summer',
+                                         'summer', 'summer', 'autumn', 'autumn', 'autumn', 'winter'])
         
     def load_data(self, filepath=None):
-        """Load tide data from CSV or create sample data"""
-        if filepath:
+        """Load tide data from CSV/Parquet/NPZ or create sample data"""
+        if filepath and filepath.endswith('.parquet'):
+            self.df = pd.read_parquet(filepath, engine='pyarrow')
+        elif filepath and filepath.endswith('.npz'):
+            with np.load(filepath) as arrays:
+                self.df = pd.DataFrame({name: arrays[name] for name in arrays.files})
+        elif filepath:
             self.df = pd.read_csv(filepath)
             self.df['datetime'] = pd.to_datetime(self.df['datetime'])
         else:
@@ -31,30 +63,129 @@ class TideDataProcessor:
     
     def detect_high_low_tides(self):
         """Detect high and low tides using signal processing"""
-        # Sort data by datetime
-        df_sorted = self.df.sort_values('datetime').copy()
+        # Sort data by datetime; loaded data is usually sorted already, and a shallow
+        # copy is enough since only a new column is added
+        df_sorted = self._sorted_by_datetime(self.df)
         
         # Find peaks (high tides) and troughs (low tides)
-        heights = df_sorted['height'].values
-        
-        # Use scipy to find peaks and troughs
-        high_tide_indices, _ = signal.find_peaks(heights, distance=2, prominence=0.3)
-        low_tide_indices, _ = signal.find_peaks(-heights, distance=2, prominence=0.3)
+        heights = self._height_stats(df_sorted).arr
+        high_tide_indices, low_tide_indices = self._find_tide_extrema(heights)
         
-        # Mark tide types
-        df_sorted['tide_type'] = 'normal'
-        df_sorted.loc[df_sorted.index[high_tide_indices], 'tide_type'] = 'high'
-        df_sorted.loc[df_sorted.index[low_tide_indices], 'tide_type'] = 'low'
+        # Mark tide types as int8 codes into a categorical column
+        codes = np.zeros(len(df_sorted), dtype=np.int8)
+        codes[high_tide_indices] = 1
+        codes[low_tide_indices] = 2
+        df_sorted['tide_type'] = pd.Categorical.from_codes(codes, categories=['normal', 'high', 'low'])
         
         self.processed_df = df_sorted
         return df_sorted
     
+    def _find_tide_extrema(self, heights):
+        """Indices of high and low tides in a float64 height array"""
+        # Strict local extrema (plateau midpoints included) are never adjacent, so
+        # a minimum peak distance of 2 always holds and the distance pass is skipped
+        heights = np.ascontiguousarray(heights, dtype=np.float64)
+        troughs = np.negative(heights)
+        
+        if len(heights) < self.parallel_extrema_min_size:
+            high_tide_indices, _ = signal.find_peaks(heights, prominence=0.3)
+            low_tide_indices, _ = signal.find_peaks(troughs, prominence=0.3)
+            return high_tide_indices, low_tide_indices
+        
+        # scipy's peak and prominence kernels run without the GIL, so the two
+        # independent searches overlap on threads without copying the data
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            highs = executor.submit(signal.find_peaks, heights, prominence=0.3)
+            lows = executor.submit(signal.find_peaks, troughs, prominence=0.3)
+            return highs.result()[0], lows.result()[0]
+    
+    def _height_change_features(self, heights, time_ns):
+        """Height change and hourly change rate as an (n, 2) array, NaN in the first row"""
+        features = np.full((len(heights), 2), np.nan)
+        if len(heights) > 1:
+            change = features[1:, 0]
+            rate = features[1:, 1]
+            np.subtract(heights[1:], heights[:-1], out=change)
+            
+            # Hours between samples, written straight into the rate column
+            np.subtract(time_ns[1:], time_ns[:-1], out=rate, casting='unsafe')
+            rate /= 3.6e12
+            
+            # Repeated timestamps give inf/NaN rates, as the Series division did
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.divide(change, rate, out=rate)
+        return features
+    
+    def _sorted_by_datetime(self, df):
+        """Frame ordered by datetime, a shallow copy when it is already in order"""
+        if df['datetime'].is_monotonic_increasing:
+            return df.copy(deep=False)
+        return df.sort_values('datetime')
+    
+    def _height_stats(self, df):
+        """Summary statistics of the height column, computed once per frame"""
+        if self._stats is None or self._stats.frame is not df:
+            arr = df['height'].to_numpy(dtype=np.float64)
+            
+            # Missing heights are skipped, as the pandas reductions did
+            count = int(np.count_nonzero(np.isfinite(arr)))
+            has_data = count > 0
+            self._stats = SimpleNamespace(
+                frame=df,
+                arr=arr,
+                count=count,
+                mean=np.nanmean(arr) if has_data else np.nan,
+                std=np.nanstd(arr, ddof=1) if count > 1 else np.nan,
+                min=np.nanmin(arr) if has_data else np.nan,
+                max=np.nanmax(arr) if has_data else np.nan
+            )
+        return self._stats
+    
+    def _centered_moving_average(self, values, window):
+        """Centered moving average from a cumulative sum, NaN where the window is incomplete"""
+        n = len(values)
+        ma = np.full(n, np.nan)
+        if n < window:
+            return ma
+        
+        missing = np.isnan(values)
+        if missing.all():
+            return ma
+        
+        # Shift by the mean so the running sum doesn't lose precision over long series
+        offset = np.nanmean(values)
+        csum = np.concatenate(([0.0], np.cumsum(np.where(missing, 0.0, values - offset))))
+        window_ma = (csum[window:] - csum[:-window]) / window + offset
+        
+        # Windows holding a missing height stay NaN, as with pandas rolling()
+        if missing.any():
+            nan_count = np.concatenate(([0], np.cumsum(missing)))
+            window_ma[nan_count[window:] != nan_count[:-window]] = np.nan
+        
+        # Same alignment as pandas rolling(center=True)
+        start = window // 2
+        ma[start:start + n - window + 1] = window_ma
+        return ma
+    
+    def _trig_feature(self, func, values, omega):
+        """func(omega * values) evaluated in a single output buffer"""
+        out = np.multiply(values, omega)
+        return func(out, out=out)
+    
+    def _sin_cos_features(self, values, omega):
+        """sin and cos of omega * values sharing one phase array"""
+        phase = np.multiply(values, omega)
+        cos = np.cos(phase)
+        return np.sin(phase, out=phase), cos
+    
     def add_tidal_features(self):
         """Add advanced tidal features"""
         if self.processed_df is None:
             self.detect_high_low_tides()
         
-        df = self.processed_df.copy()
+        # New columns go on a shallow copy; existing column data is shared
+        stats = self._height_stats(self.processed_df)
+        df = self.processed_df.copy(deep=False)
         
         # Tidal range (difference between consecutive high and low tides)
         high_tides = df[df['tide_type'] == 'high']['height']
@@ -65,40 +196,52 @@ class TideDataProcessor:
             avg_low = low_tides.mean()
             df['tidal_range'] = avg_high - avg_low
         else:
-            df['tidal_range'] = df['height'].max() - df['height'].min()
+            df['tidal_range'] = stats.max - stats.min
         
         # Rate of change
-        df['height_change'] = df['height'].diff()
-        df['height_change_rate'] = df['height_change'] / df['datetime'].diff().dt.total_seconds() * 3600  # per hour
+        change_features = self._height_change_features(
+            stats.arr,
+            df['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        )
+        df['height_change'] = change_features[:, 0]
+        df['height_change_rate'] = change_features[:, 1]  # per hour
         
         # Moving averages
-        df['height_ma_6h'] = df['height'].rolling(window=6, center=True).mean()
-        df['height_ma_24h'] = df['height'].rolling(window=24, center=True).mean()
+        df['height_ma_6h'] = self._centered_moving_average(stats.arr, 6)
+        df['height_ma_24h'] = self._centered_moving_average(stats.arr, 24)
         
         # Seasonal decomposition components
-        df['day_sin'] = np.sin(2 * np.pi * df['day_of_year'] / 365.25)
-        df['day_cos'] = np.cos(2 * np.pi * df['day_of_year'] / 365.25)
-        df['hour_sin'] = np.sin(2 * np.pi * df['time_decimal'] / 24)
-        df['hour_cos'] = np.cos(2 * np.pi * df['time_decimal'] / 24)
+        day_of_year = df['day_of_year'].to_numpy(dtype=np.float64)
+        df['day_sin'], df['day_cos'] = self._sin_cos_features(day_of_year, self.annual_omega)
+        
+        # Hourly phases all share 2*pi*time_decimal, scaled by each reciprocal period
+        time_radians = np.multiply(df['time_decimal'].to_numpy(dtype=np.float64), 2 * np.pi)
+        df['hour_sin'], df['hour_cos'] = self._sin_cos_features(time_radians, self.daily_inv_period)
         
         # Tidal harmonics (simplified)
-        df['M2_component'] = np.sin(2 * np.pi * df['time_decimal'] / 12.42)  # Principal lunar semi-diurnal
-        df['S2_component'] = np.sin(2 * np.pi * df['time_decimal'] / 12.00)  # Principal solar semi-diurnal
-        df['K1_component'] = np.sin(2 * np.pi * df['time_decimal'] / 23.93)  # Lunar diurnal
-        df['O1_component'] = np.sin(2 * np.pi * df['time_decimal'] / 25.82)  # Lunar diurnal
+        for name, inv_period in self.constituent_inv_periods.items():
+            df[f'{name}_component'] = self._trig_feature(np.sin, time_radians, inv_period)
         
         # Anomalies detection
-        height_std = df['height'].std()
-        height_mean = df['height'].mean()
-        df['is_anomaly'] = np.abs(df['height'] - height_mean) > 2 * height_std
-        
-        # Tidal categories
-        df['tide_category'] = pd.cut(
-            df['height'], 
-            bins=5, 
-            labels=['Very Low', 'Low', 'Medium', 'High', 'Very High']
+        df['is_anomaly'] = np.abs(stats.arr - stats.mean) > 2 * stats.std
+        
+        # Tidal categories: 5 equal-width, right-closed bins over the height range
+        lo, hi = stats.min, stats.max
+        if lo == hi:
+            # Same widening pd.cut applies to a constant series
+            pad = 0.001 * abs(lo) if lo != 0 else 0.001
+            lo, hi = lo - pad, hi + pad
+        edges = np.linspace(lo, hi, 6)[1:-1]
+        codes = np.digitize(stats.arr, edges, right=True).astype(np.int8)
+        codes[np.isnan(stats.arr)] = -1  # missing heights get no category
+        df['tide_category'] = pd.Categorical.from_codes(
+            codes,
+            categories=['Very Low', 'Low', 'Medium', 'High', 'Very High'],
+            ordered=True
         )
         
+        # Heights are unchanged, so the cached statistics carry over to the new frame
+        stats.frame = df
         self.processed_df = df
         return df
     
@@ -107,22 +250,22 @@ class TideDataProcessor:
         if self.processed_df is None:
             self.add_tidal_features()
         
-        df = self.processed_df.copy()
-        
         # FFT analysis
-        heights = df['height'].values
+        heights = self._height_stats(self.processed_df).arr
         n = len(heights)
         
         # Remove trend
-        detrended = signal.detrend(heights)
+        detrended = np.ascontiguousarray(signal.detrend(heights), dtype=np.float64)
         
-        # Apply FFT
-        yf = fft(detrended)
-        xf = fftfreq(n, d=1)  # Assuming 1-hour sampling
+        # Apply FFT (real input, so only the non-negative half of the spectrum)
+        yf = rfft(detrended, workers=-1)
+        xf = rfftfreq(n, d=1)  # Assuming 1-hour sampling
         
         # Find dominant frequencies
         power = np.abs(yf)
-        dominant_freqs = xf[np.argsort(power)[-10:]]  # Top 10 frequencies
+        k = min(10, len(power))
+        top = np.argpartition(power, -k)[-k:]
+        dominant_freqs = xf[top[np.argsort(power[top])]]  # Top 10 frequencies, ascending power
         
         harmonic_analysis = {
             'frequencies': dominant_freqs,
@@ -133,26 +276,78 @@ class TideDataProcessor:
         
         return harmonic_analysis
     
+    def _grouped_describe(self, values, keys, groups):
+        """describe() of values per key, one row per group (empty groups have count 0)"""
+        described = values.groupby(keys).describe().reindex(groups)
+        described['count'] = described['count'].fillna(0)
+        return described
+    
+    def _monthly_stats(self, heights, months):
+        """Per-month mean/std/min/max from one stable sort and segment reductions"""
+        if len(months) == 0:
+            return pd.DataFrame(columns=['mean', 'std', 'min', 'max'], index=pd.Index(months, name='month'), dtype=np.float64)
+        
+        # Missing heights are skipped, as the grouped pandas reductions did; a
+        # month left with no heights comes back as a row of NaN
+        finite = np.isfinite(heights)
+        if not finite.all():
+            return self._monthly_stats(heights[finite], months[finite]).reindex(
+                pd.Index(np.unique(months), name='month')
+            )
+        
+        order = np.argsort(months, kind='stable')
+        months_sorted = months[order]
+        heights_sorted = heights[order]
+        
+        # Start of each month's segment in the sorted heights
+        starts = np.flatnonzero(np.r_[True, months_sorted[1:] != months_sorted[:-1]])
+        counts = np.diff(np.r_[starts, len(months_sorted)])
+        
+        means = np.add.reduceat(heights_sorted, starts) / counts
+        deviations = heights_sorted - np.repeat(means, counts)
+        squares = np.add.reduceat(deviations * deviations, starts)
+        stds = np.full(len(starts), np.nan)
+        np.divide(squares, counts - 1, out=stds, where=counts > 1)
+        
+        return pd.DataFrame(
+            {
+                'mean': means,
+                'std': np.sqrt(stds),
+                'min': np.minimum.reduceat(heights_sorted, starts),
+                'max': np.maximum.reduceat(heights_sorted, starts),
+            },
+            index=pd.Index(months_sorted[starts], name='month')
+        )
+    
     def calculate_statistics(self):
         """Calculate comprehensive statistics"""
         if self.processed_df is None:
             self.add_tidal_features()
         
         df = self.processed_df
+        height_stats = self._height_stats(df)
+        quartiles = (np.nanpercentile(height_stats.arr, [25, 50, 75])
+                     if height_stats.count else np.full(3, np.nan))
+        
+        # One grouped describe() each for seasons and weekday/weekend
+        months = df['month'].to_numpy()
+        season = self.season_of_month[months]
+        seasonal = self._grouped_describe(df['height'], season, self.seasons)
+        weekend = self._grouped_describe(df['height'], df['is_weekend'].to_numpy(), [False, True])
         
         stats = {
-            'basic_stats': df['height'].describe(),
-            'monthly_stats': df.groupby('month')['height'].agg(['mean', 'std', 'min', 'max']),
+            'basic_stats': pd.Series(
+                [height_stats.count, height_stats.mean, height_stats.std, height_stats.min,
+                 *quartiles, height_stats.max],
+                index=['count', 'mean', 'std', 'min', '25%', '50%', '75%', 'max'],
+                name='height'
+            ),
+            'monthly_stats': self._monthly_stats(height_stats.arr, months),
             'tide_type_stats': df.groupby('tide_type')['height'].agg(['count', 'mean', 'std']),
-            'seasonal_stats': {
-                'spring': df[df['month'].isin([3, 4, 5])]['height'].describe(),
-                'summer': df[df['month'].isin([6, 7, 8])]['height'].describe(),
-                'autumn': df[df['month'].isin([9, 10, 11])]['height'].describe(),
-                'winter': df[df['month'].isin([12, 1, 2])]['height'].describe(),
-            },
+            'seasonal_stats': {name: seasonal.loc[name].rename('height') for name in self.seasons},
             'weekend_stats': {
-                'weekday': df[~df['is_weekend']]['height'].describe(),
-                'weekend': df[df['is_weekend']]['height'].describe(),
+                'weekday': weekend.loc[False].rename('height'),
+                'weekend': weekend.loc[True].rename('height'),
             }
         }
         
@@ -163,7 +358,7 @@ class TideDataProcessor:
         if self.processed_df is None:
             self.add_tidal_features()
         
-        df = self.processed_df.sort_values('datetime')
+        df = self._sorted_by_datetime(self.processed_df)
         
         # Create new time index with higher resolution
         start_date = df['datetime'].min()
@@ -174,32 +369,63 @@ class TideDataProcessor:
             freq=f'{int(resolution_hours * 60)}min'
         )
         
-        # Interpolate height values
-        df_indexed = df.set_index('datetime')
-        interpolated = df_indexed['height'].reindex(new_index).interpolate(method='cubic')
+        # Interpolate height values with a cubic spline through every sample with
+        # a known height, on hours since the first one (strictly increasing timestamps)
+        t_ns = df['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        heights = df['height'].to_numpy(dtype=np.float64)
+        known = np.isfinite(heights)
+        if not known.all():
+            t_ns, heights = t_ns[known], heights[known]
+        t_ns, first = np.unique(t_ns, return_index=True)
+        heights = heights[first]
+        new_ns = new_index.to_numpy(dtype='datetime64[ns]').view(np.int64)
+        
+        if len(t_ns) > 1:
+            spline = CubicSpline((t_ns - t_ns[0]) / 3.6e12, heights)
+            interpolated = spline((new_ns - t_ns[0]) / 3.6e12)
+        else:
+            interpolated = np.full(len(new_ns), heights[0] if len(heights) else np.nan)
         
         # Create new dataframe
         interpolated_df = pd.DataFrame({
             'datetime': new_index,
-            'height': interpolated.values
+            'height': interpolated
         })
         
-        # Add time features
-        interpolated_df['hour'] = interpolated_df['datetime'].dt.hour
-        interpolated_df['minute'] = interpolated_df['datetime'].dt.minute
+        # Add time features from whole seconds of the grid timestamps
+        seconds = new_ns // 1_000_000_000
+        hour = (seconds // 3600 % 24).astype(np.int32)
+        minute = (seconds // 60 % 60).astype(np.int32)
+        interpolated_df['hour'] = hour
+        interpolated_df['minute'] = minute
         interpolated_df['day_of_year'] = interpolated_df['datetime'].dt.dayofyear
-        interpolated_df['time_decimal'] = (
-            interpolated_df['hour'] + interpolated_df['minute'] / 60.0
-        )
+        interpolated_df['time_decimal'] = hour + minute / 60.0
         
         return interpolated_df
     
-    def save_processed_data(self, filename='processed_tide_data.csv'):
-        """Save processed data to CSV"""
+    def save_processed_data(self, filename='processed_tide_data.parquet'):
+        """Save processed data to Parquet with float32 height-derived columns"""
         if self.processed_df is not None:
-            filepath = f"data/{filename}"
-            self.processed_df.to_csv(filepath, index=False)
+            self._data_dir.mkdir(exist_ok=True)
+            filepath = self._data_dir / Path(filename).with_suffix('.parquet').name
+            
+            # Centimetre-precision heights fit comfortably in float32
+            float32_columns = [
+                'height', 'height_change', 'height_change_rate', 'height_ma_6h', 'height_ma_24h',
+                'M2_component', 'S2_component', 'K1_component', 'O1_component',
+                'day_sin', 'day_cos', 'hour_sin', 'hour_cos'
+            ]
+            df = self.processed_df.astype(
+                {c: np.float32 for c in float32_columns if c in self.processed_df.columns}
+            )
+            df.to_parquet(filepath, engine='pyarrow', compression='zstd', index=False)
             print(f"Processed data saved to {filepath}")
+            
+            # Numeric columns also go to a compressed .npz for array-only consumers
+            numeric = df.select_dtypes(include=['number', 'bool', 'datetime'])
+            npz_path = filepath.with_suffix('.npz')
+            np.savez_compressed(npz_path, **{c: numeric[c].to_numpy() for c in numeric.columns})
+            print(f"Numeric arrays saved to {npz_path}")
             return filepath
         else:
             print("No processed data to save. Run processing methods first.")
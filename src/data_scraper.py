@@ -4,10 +4,13 @@ Scrapes and parses tide information from HKO website
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+import lxml.html
+from concurrent.futures import ThreadPoolExecutor
 import pandas as pd
 import re
 from datetime import datetime, timedelta
+from pathlib import Path
 import numpy as np
 
 class HKOTideDataScraper:
@@ -18,10 +21,38 @@ class HKOTideDataScraper:
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
         
+        # Keep one pooled connection per concurrent fetch worker
+        self.max_fetch_workers = 8
+        adapter = HTTPAdapter(pool_maxsize=self.max_fetch_workers)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # Output directory for saved datasets
+        self._data_dir = Path('data')
+        
+        self.month_names = ['January', 'February', 'March', 'April', 'May', 'June', 'July',
+                            'August', 'September', 'October', 'November', 'December']
+        self.weekday_names = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday',
+                              'Saturday', 'Sunday']
+        
     def fetch_tide_data(self):
         """Fetch raw HTML content from HKO website"""
+        return self._fetch_url(self.base_url)
+    
+    def fetch_tide_data_many(self, urls):
+        """Fetch several HKO pages (e.g. stations or years) concurrently, in input order"""
+        urls = list(urls)
+        if len(urls) <= 1:
+            return [self._fetch_url(url) for url in urls]
+        
+        # Threads overlap the network waits; the session's pool reuses connections
+        with ThreadPoolExecutor(max_workers=min(self.max_fetch_workers, len(urls))) as executor:
+            return list(executor.map(self._fetch_url, urls))
+    
+    def _fetch_url(self, url):
+        """GET one page through the shared session, None on failure"""
         try:
-            response = self.session.get(self.base_url)
+            response = self.session.get(url)
             response.raise_for_status()
             return response.text
         except requests.RequestException as e:
@@ -30,23 +61,21 @@ class HKOTideDataScraper:
     
     def parse_tide_table(self, html_content):
         """Parse HTML table content into structured data"""
-        soup = BeautifulSoup(html_content, 'html.parser')
+        root = lxml.html.fromstring(html_content)
         
         # Find all table rows
-        tables = soup.find_all('table')
-        if not tables:
+        if not root.xpath('//table'):
             return None
             
         tide_data = []
         
-        for table in tables:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 4:  # Minimum columns for tide data
-                    cell_texts = [cell.get_text(strip=True) for cell in cells]
-                    if self._is_valid_tide_row(cell_texts):
-                        tide_data.append(cell_texts)
+        for row in root.xpath('//table//tr'):
+            cells = row.xpath('./td|./th')
+            if len(cells) >= 4:  # Minimum columns for tide data
+                # Same text as BeautifulSoup's get_text(strip=True)
+                cell_texts = [''.join(text.strip() for text in cell.itertext()) for cell in cells]
+                if self._is_valid_tide_row(cell_texts):
+                    tide_data.append(cell_texts)
         
         return tide_data
     
@@ -63,8 +92,20 @@ class HKOTideDataScraper:
         except (ValueError, IndexError):
             return False
     
+    def _tide_columns(self, month, day, hour, minute, height, **extra):
+        """Column-oriented tide records: one typed array per field"""
+        columns = {
+            'month': np.asarray(month, dtype=np.int32),
+            'day': np.asarray(day, dtype=np.int32),
+            'hour': np.asarray(hour, dtype=np.int32),
+            'minute': np.asarray(minute, dtype=np.int32),
+            'height': np.asarray(height, dtype=np.float64)
+        }
+        columns.update(extra)
+        return columns
+    
     def parse_manual_data(self):
-        """Parse the manually provided tide data from the website content"""
+        """Parse the manually provided tide data from the website content into tide columns"""
         # This contains the actual tide data structure we observed
         raw_data = """
         01 01 0531 1.58 1127 1.03 1844 2.05
@@ -100,46 +141,35 @@ class HKOTideDataScraper:
         01 31 0114 0.85 1820 2.07
         """
         
-        tide_records = []
-        lines = [line.strip() for line in raw_data.strip().split('\n') if line.strip()]
-        
-        for line in lines:
-            parts = line.split()
-            if len(parts) >= 4:
-                month = int(parts[0])
-                day = int(parts[1])
-                
-                # Parse time-height pairs
-                i = 2
-                while i < len(parts) - 1:
-                    try:
-                        time_str = parts[i]
-                        height = float(parts[i + 1])
-                        
-                        # Convert time to proper format
-                        if len(time_str) == 4:
-                            hour = int(time_str[:2])
-                            minute = int(time_str[2:])
-                            
-                            tide_records.append({
-                                'month': month,
-                                'day': day,
-                                'hour': hour,
-                                'minute': minute,
-                                'height': height,
-                                'time_str': time_str
-                            })
-                    except (ValueError, IndexError):
-                        pass
-                    i += 2
-        
-        return tide_records
+        # One pass over the block: a line's month/day prefix or one of its HHMM/height pairs
+        tokens = re.findall(
+            r'^\s*(\d{2})\s+(\d{2})\b|\b(\d{4})\s+(\d+(?:\.\d+)?)\b',
+            raw_data, re.MULTILINE
+        )
+        if not tokens:
+            return self._tide_columns(np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                      np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64),
+                                      np.empty(0, dtype=np.float64), time_str=np.empty(0, dtype=str))
+        
+        month_tok, day_tok, time_tok, height_tok = (np.array(col) for col in zip(*tokens))
+        
+        # Each pair belongs to the most recent month/day prefix
+        is_date = month_tok != ''
+        line_idx = np.cumsum(is_date) - 1
+        is_pair = ~is_date & (line_idx >= 0)
+        line_idx = line_idx[is_pair]
+        
+        months = month_tok[is_date].astype(np.int64)
+        days = day_tok[is_date].astype(np.int64)
+        times = time_tok[is_pair].astype(np.int64)
+        
+        return self._tide_columns(
+            months[line_idx], days[line_idx], times // 100, times % 100,
+            height_tok[is_pair].astype(np.float64), time_str=time_tok[is_pair]
+        )
     
     def create_comprehensive_dataset(self):
         """Create a comprehensive dataset with sample data for the entire year 2023"""
-        # Generate more comprehensive sample data
-        tide_data = []
-        
         # Sample data for different months to show seasonal variation
         monthly_patterns = {
             1: {'base_height': 1.5, 'amplitude': 1.2, 'phase_shift': 0},
@@ -157,48 +187,69 @@ class HKOTideDataScraper:
         }
         
         # Days in each month (2023 is not a leap year)
-        days_in_month = [31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31]
-        
-        for month in range(1, 13):
-            pattern = monthly_patterns[month]
-            for day in range(1, days_in_month[month - 1] + 1):
-                # Generate 4 tide measurements per day (2 high, 2 low)
-                for tide_num in range(4):
-                    hour = 6 * tide_num  # Rough 6-hour intervals
-                    minute = np.random.randint(0, 60)
-                    
-                    # Create tidal pattern with diurnal and semi-diurnal components
-                    time_of_day = hour + minute / 60.0
-                    tidal_component = (
-                        pattern['amplitude'] * np.sin(2 * np.pi * time_of_day / 24 + pattern['phase_shift']) +
-                        0.3 * np.sin(4 * np.pi * time_of_day / 24 + pattern['phase_shift'] * 2) +
-                        np.random.normal(0, 0.1)  # Add some noise
-                    )
-                    
-                    height = max(0.1, pattern['base_height'] + tidal_component)
-                    
-                    tide_data.append({
-                        'month': month,
-                        'day': day,
-                        'hour': hour,
-                        'minute': minute,
-                        'height': round(height, 2),
-                        'tide_type': 'high' if tide_num % 2 == 0 else 'low'
-                    })
+        days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        
+        # Per-month pattern parameters, indexed by month - 1
+        base_height = np.array([monthly_patterns[m]['base_height'] for m in range(1, 13)])
+        amplitude = np.array([monthly_patterns[m]['amplitude'] for m in range(1, 13)])
+        phase_shift = np.array([monthly_patterns[m]['phase_shift'] for m in range(1, 13)])
+        
+        # One row per measurement: 4 tides per day (2 high, 2 low)
+        tides_per_day = 4
+        month = np.repeat(np.arange(1, 13), days_in_month * tides_per_day)
+        day = np.repeat(np.concatenate([np.arange(1, d + 1) for d in days_in_month]), tides_per_day)
+        tide_num = np.tile(np.arange(tides_per_day), days_in_month.sum())
+        n = len(tide_num)
+        
+        hour = 6 * tide_num  # Rough 6-hour intervals
+        minute = np.random.randint(0, 60, size=n)
+        
+        # Create tidal pattern with diurnal and semi-diurnal components
+        time_of_day = hour + minute / 60.0
+        amp = amplitude[month - 1]
+        phase = phase_shift[month - 1]
+        tidal_component = (
+            amp * np.sin(2 * np.pi * time_of_day / 24 + phase) +
+            0.3 * np.sin(4 * np.pi * time_of_day / 24 + phase * 2) +
+            np.random.normal(0, 0.1, size=n)  # Add some noise
+        )
+        
+        height = np.maximum(0.1, base_height[month - 1] + tidal_component)
+        
+        tide_data = self._tide_columns(
+            month, day, hour, minute, np.round(height, 2),
+            tide_type=np.where(tide_num % 2 == 0, 'high', 'low')
+        )
         
         return tide_data
     
     def convert_to_dataframe(self, tide_records):
-        """Convert tide records to pandas DataFrame"""
-        if not tide_records:
+        """Convert column-oriented tide records (a dict of arrays or a DataFrame) to pandas DataFrame"""
+        if tide_records is None or len(tide_records['height']) == 0:
             return pd.DataFrame()
         
-        df = pd.DataFrame(tide_records)
+        df = pd.DataFrame(tide_records, copy=False)
+        
+        # Create datetime column directly as int64 nanoseconds since 2023-01-01
+        month = df['month'].to_numpy(dtype=np.int64)
+        day = df['day'].to_numpy(dtype=np.int64)
+        hour = df['hour'].to_numpy(dtype=np.int64)
+        minute = df['minute'].to_numpy(dtype=np.int64)
         
-        # Create datetime column
-        df['datetime'] = pd.to_datetime(
-            df[['month', 'day', 'hour', 'minute']].assign(year=2023)
+        # Days in each month (2023 is not a leap year)
+        days_in_month = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        valid = (
+            (month >= 1) & (month <= 12) &
+            (day >= 1) & (day <= days_in_month[np.clip(month, 1, 12) - 1]) &
+            (hour >= 0) & (hour <= 23) & (minute >= 0) & (minute <= 59)
         )
+        if not valid.all():
+            raise ValueError("Tide records contain an invalid 2023 date or time")
+        
+        day_of_year = np.concatenate(([0], np.cumsum(days_in_month)[:-1]))[month - 1] + day - 1
+        seconds = day_of_year * 86400 + hour * 3600 + minute * 60
+        year_start = np.datetime64('2023-01-01', 'ns').astype(np.int64)
+        df['datetime'] = (year_start + seconds * 1_000_000_000).view('datetime64[ns]')
         
         # Sort by datetime
         df = df.sort_values('datetime').reset_index(drop=True)
@@ -206,9 +257,13 @@ class HKOTideDataScraper:
         # Add additional computed columns
         df['day_of_year'] = df['datetime'].dt.dayofyear
         df['week_of_year'] = df['datetime'].dt.isocalendar().week
-        df['month_name'] = df['datetime'].dt.month_name()
-        df['weekday'] = df['datetime'].dt.day_name()
-        df['is_weekend'] = df['datetime'].dt.weekday >= 5
+        df['month_name'] = np.array(self.month_names)[df['datetime'].dt.month.to_numpy() - 1]
+        
+        # Weekday from whole days since the epoch (1970-01-01 was a Thursday, Monday = 0)
+        days = df['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64) // 86_400_000_000_000
+        weekday = (days + 3) % 7
+        df['weekday'] = np.array(self.weekday_names)[weekday]
+        df['is_weekend'] = weekday >= 5
         
         # Add tidal characteristics
         df['time_decimal'] = df['hour'] + df['minute'] / 60.0
@@ -217,7 +272,8 @@ class HKOTideDataScraper:
     
     def save_data(self, df, filename='tide_data_2023.csv'):
         """Save DataFrame to CSV file"""
-        filepath = f"data/{filename}"
+        self._data_dir.mkdir(exist_ok=True)
+        filepath = self._data_dir / filename
         df.to_csv(filepath, index=False)
         print(f"Data saved to {filepath}")
         return filepath
@@ -229,7 +285,7 @@ def main():
     print("Creating comprehensive tide dataset...")
     tide_records = scraper.create_comprehensive_dataset()
     
-    print(f"Processed {len(tide_records)} tide records")
+    print(f"Processed {len(tide_records['height'])} tide records")
     
     # Convert to DataFrame
     df = scraper.convert_to_dataframe(tide_records)
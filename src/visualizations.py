@@ -4,17 +4,24 @@ Creates stunning interactive plots and animations
 """
 
 import plotly.graph_objects as go
-import plotly.express as px
+import plotly.io as pio
 from plotly.subplots import make_subplots
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime, timedelta
+import weakref
 import warnings
 warnings.filterwarnings('ignore')
 
+# Serialize figures with orjson, which encodes NumPy arrays natively
+pio.json.config.default_engine = 'orjson'
+
 class TideVisualizer:
+    # Last day/hour aggregation as (weakref to frame, fingerprint, result); class-level
+    # because the app builds a fresh visualizer for each figure, and weak so the
+    # cache never keeps a frame alive on its own
+    _day_hour_cache = None
+    
     def __init__(self):
         self.colors = {
             'primary': '#1f77b4',
@@ -34,16 +41,89 @@ class TideVisualizer:
             'font_color': '#ffffff',
             'grid_color': '#2a2e39'
         }
+        
+        # Background and font shared by every figure's layout
+        self._base_layout = dict(
+            plot_bgcolor=self.theme['bg_color'],
+            paper_bgcolor=self.theme['paper_bgcolor'],
+            font=dict(color=self.theme['font_color'])
+        )
+        
+        # Long line traces are reduced to about this many points before plotting,
+        # and only shorter ones get browser-side spline smoothing
+        self.max_line_points = 2000
+        self.max_spline_points = 500
+    
+    def _downsample(self, df_sorted, n_out=None):
+        """MinMax-downsample a time-sorted frame, keeping each bucket's lowest and highest height"""
+        n_out = n_out or self.max_line_points
+        n = len(df_sorted)
+        if n <= n_out:
+            return df_sorted
+        
+        # Equal-count buckets over the sorted rows; the last is padded with its final value
+        n_buckets = max(n_out // 2, 1)
+        bucket_size = -(-n // n_buckets)
+        heights = df_sorted['height'].to_numpy(dtype=np.float64)
+        padded = np.pad(heights, (0, n_buckets * bucket_size - n), mode='edge').reshape(n_buckets, bucket_size)
+        
+        offsets = np.arange(n_buckets) * bucket_size
+        keep = np.concatenate([
+            [0, n - 1],
+            np.minimum(offsets + padded.argmin(axis=1), n - 1),
+            np.minimum(offsets + padded.argmax(axis=1), n - 1)
+        ])
+        return df_sorted.iloc[np.unique(keep)]
+    
+    def _day_hour_mean(self, df):
+        """Mean height per (day of year, hour) as float32, over the days and hours present (missing pairs are 0)"""
+        times = df['datetime'].to_numpy()
+        days = times.astype('datetime64[D]')
+        day_of_year = (days - days.astype('datetime64[Y]')).astype(np.int64) + 1
+        hour = (times.astype('datetime64[h]') - days).astype(np.int64)
+        
+        # Accumulate sums and counts on a flat 367 x 24 grid
+        cell = day_of_year * 24 + hour
+        sums = np.bincount(cell, weights=df['height'].to_numpy(dtype=np.float64), minlength=367 * 24).reshape(367, 24)
+        counts = np.bincount(cell, minlength=367 * 24).reshape(367, 24)
+        
+        present_days = np.flatnonzero(counts.any(axis=1))
+        present_hours = np.flatnonzero(counts.any(axis=0))
+        sums = sums[np.ix_(present_days, present_hours)]
+        counts = counts[np.ix_(present_days, present_hours)]
+        means = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        
+        # The grid goes straight into heatmap/surface z, where float32 halves the payload
+        return means.astype(np.float32), present_days.astype(np.int16), present_hours.astype(np.int8)
+    
+    def _cached_day_hour_mean(self, df):
+        """_day_hour_mean, reused when the heatmap and surface are drawn from the same frame"""
+        times = df['datetime'].to_numpy(dtype='datetime64[ns]').view(np.int64)
+        fingerprint = (len(times), times[0], times[-1]) if len(times) else (0,)
+        
+        cached = TideVisualizer._day_hour_cache
+        if cached is None or cached[0]() is not df or cached[1] != fingerprint:
+            cached = (weakref.ref(df), fingerprint, self._day_hour_mean(df))
+            TideVisualizer._day_hour_cache = cached
+        return cached[2]
     
     def create_wave_animation(self, df, height=600, enhanced=False):
         """Create animated wave visualization with enhanced effects"""
-        # Create interpolated data for smooth animation
-        df_sorted = df.sort_values('datetime')
+        # Create interpolated data for smooth animation; only the line traces are
+        # reduced to what the plot can show, so every high and low keeps its marker
+        df_full = df.sort_values('datetime')
+        df_sorted = self._downsample(df_full)
         
-        fig = go.Figure()
+        # Traces get plain arrays; centimetre heights serialize compactly as float32
+        times = df_sorted['datetime'].to_numpy()
+        heights = df_sorted['height'].to_numpy(dtype=np.float32)
+        
+        # Traces are collected as plain dicts and the figure is built once
+        traces = []
         
         if enhanced:
-            # Enhanced wave with multiple layers and animations
+            # Enhanced wave with multiple layers and animations; the dense layers
+            # render through WebGL, which draws straight segments between samples
             # Create wave layers with different opacities
             wave_layers = [
                 {'opacity': 0.8, 'width': 4, 'offset': 0},
@@ -52,20 +132,21 @@ class TideVisualizer:
                 {'opacity': 0.2, 'width': 1, 'offset': 0.15}
             ]
             
+            # Add wave motion effect: one (layers, samples) array from a shared base phase
+            phase = 2 * np.pi * np.arange(len(df_sorted)) / 50
+            offsets = np.array([layer['offset'] for layer in wave_layers])
+            phase_shifts = np.arange(len(wave_layers)) * np.pi/4
+            wave_heights = (heights + offsets[:, None] * np.sin(phase + phase_shifts[:, None])).astype(np.float32)
+            
             for i, layer in enumerate(wave_layers):
-                # Add wave motion effect
-                wave_heights = df_sorted['height'] + layer['offset'] * np.sin(
-                    2 * np.pi * np.arange(len(df_sorted)) / 50 + i * np.pi/4
-                )
-                
-                fig.add_trace(go.Scatter(
-                    x=df_sorted['datetime'],
-                    y=wave_heights,
+                traces.append(dict(
+                    type='scattergl',
+                    x=times,
+                    y=wave_heights[i],
                     mode='lines',
                     line=dict(
                         color=f'rgba(103, 183, 220, {layer["opacity"]})',
-                        width=layer['width'],
-                        shape='spline'
+                        width=layer['width']
                     ),
                     fill='tonexty' if i == 0 else None,
                     fillcolor=f'rgba(74, 144, 226, {layer["opacity"] * 0.3})',
@@ -76,9 +157,10 @@ class TideVisualizer:
                 ))
             
             # Add animated water surface effect
-            surface_y = [df_sorted['height'].min() - 0.2] * len(df_sorted)
-            fig.add_trace(go.Scatter(
-                x=df_sorted['datetime'],
+            surface_y = np.full(len(df_sorted), heights.min() - 0.2, dtype=np.float32)
+            traces.append(dict(
+                type='scattergl',
+                x=times,
                 y=surface_y,
                 mode='lines',
                 line=dict(color='rgba(0, 100, 200, 0.3)', width=1),
@@ -90,30 +172,36 @@ class TideVisualizer:
             ))
             
         else:
-            # Standard wave visualization
-            fig.add_trace(go.Scatter(
-                x=df_sorted['datetime'],
-                y=df_sorted['height'],
+            # Standard wave visualization; straight segments once spline fitting gets costly
+            traces.append(dict(
+                type='scatter',
+                x=times,
+                y=heights,
                 mode='lines',
                 line=dict(
                     color='rgba(103, 183, 220, 0.8)',
                     width=3,
-                    shape='spline'
+                    shape='spline' if len(heights) < self.max_spline_points else 'linear'
                 ),
                 fill='tonexty',
                 fillcolor='rgba(74, 144, 226, 0.3)',
                 name='Tide Height',
+                hoveron='points',
                 hovertemplate='<b>%{x}</b><br>Height: %{y:.2f}m<extra></extra>'
             ))
         
         # Add tide markers
-        high_tides = df_sorted[df_sorted['tide_type'] == 'high']
-        low_tides = df_sorted[df_sorted['tide_type'] == 'low']
-        
-        if not high_tides.empty:
-            fig.add_trace(go.Scatter(
-                x=high_tides['datetime'],
-                y=high_tides['height'],
+        # Each mask is resolved to row positions once and reused for both arrays
+        marker_times = df_full['datetime'].to_numpy()
+        marker_heights = df_full['height'].to_numpy(dtype=np.float32)
+        high_idx = np.flatnonzero((df_full['tide_type'] == 'high').to_numpy())
+        low_idx = np.flatnonzero((df_full['tide_type'] == 'low').to_numpy())
+        
+        if len(high_idx):
+            traces.append(dict(
+                type='scatter',
+                x=marker_times[high_idx],
+                y=marker_heights[high_idx],
                 mode='markers',
                 marker=dict(
                     size=12,
@@ -125,10 +213,11 @@ class TideVisualizer:
                 hovertemplate='<b>High Tide</b><br>%{x}<br>Height: %{y:.2f}m<extra></extra>'
             ))
         
-        if not low_tides.empty:
-            fig.add_trace(go.Scatter(
-                x=low_tides['datetime'],
-                y=low_tides['height'],
+        if len(low_idx):
+            traces.append(dict(
+                type='scatter',
+                x=marker_times[low_idx],
+                y=marker_heights[low_idx],
                 mode='markers',
                 marker=dict(
                     size=12,
@@ -143,7 +232,8 @@ class TideVisualizer:
         # Apply ocean theme with enhanced styling
         title_text = '🌊 Enhanced Dynamic Tide Visualization' if enhanced else '🌊 Dynamic Tide Visualization - Hong Kong (Chek Lap Kok)'
         
-        fig.update_layout(
+        layout = dict(
+            self._base_layout,
             title=dict(
                 text=title_text,
                 font=dict(size=24, color=self.theme['font_color']),
@@ -165,22 +255,18 @@ class TideVisualizer:
                 gridcolor=self.theme['grid_color'],
                 color=self.theme['font_color'],
                 showgrid=True,
-                gridwidth=1,
-                showspikes=True,
-                spikesnap='cursor',
-                spikecolor='rgba(74, 144, 226, 0.8)',
-                spikethickness=2
+                gridwidth=1
             ),
-            plot_bgcolor=self.theme['bg_color'],
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            font=dict(color=self.theme['font_color']),
             height=height,
             legend=dict(
                 bgcolor='rgba(30, 35, 41, 0.9)',
                 bordercolor='rgba(74, 144, 226, 0.5)',
                 borderwidth=2
             ),
+            # Decorative layers skip hover; picking stays within a short cursor radius
             hovermode='x unified',
+            hoverdistance=20,
+            spikedistance=-1,
             # Enhanced animations and transitions
             transition=dict(duration=1000, easing='cubic-in-out'),
             # Add some margin for better visual effect
@@ -189,99 +275,99 @@ class TideVisualizer:
         
         # Add animation configuration for enhanced mode
         if enhanced:
-            fig.update_layout(
-                updatemenus=[{
-                    'type': 'buttons',
-                    'showactive': False,
-                    'buttons': [{
-                        'label': '▶️ Animate',
-                        'method': 'animate',
-                        'args': [None, {
-                            'frame': {'duration': 100, 'redraw': True},
-                            'transition': {'duration': 50}
-                        }]
-                    }],
-                    'x': 0.1,
-                    'y': 1.02,
-                    'bgcolor': 'rgba(74, 144, 226, 0.8)',
-                    'bordercolor': 'rgba(255, 255, 255, 0.2)',
-                    'font': {'color': 'white'}
-                }]
-            )
+            layout['updatemenus'] = [{
+                'type': 'buttons',
+                'showactive': False,
+                'buttons': [{
+                    'label': '▶️ Animate',
+                    'method': 'animate',
+                    'args': [None, {
+                        'frame': {'duration': 100, 'redraw': True},
+                        'transition': {'duration': 50}
+                    }]
+                }],
+                'x': 0.1,
+                'y': 1.02,
+                'bgcolor': 'rgba(74, 144, 226, 0.8)',
+                'bordercolor': 'rgba(255, 255, 255, 0.2)',
+                'font': {'color': 'white'}
+            }]
+        
+        fig = go.Figure(data=traces, layout=layout)
         
         return fig
     
     def create_circular_tide_clock(self, df, selected_date=None):
         """Create circular tide clock showing daily patterns"""
         if selected_date is None:
-            selected_date = df['datetime'].dt.date.iloc[0]
+            selected_date = df['datetime'].iloc[0].date()
         
-        daily_data = df[df['datetime'].dt.date == selected_date].copy()
+        # Match calendar days as datetime64[D] rather than per-row date objects
+        days = df['datetime'].to_numpy().astype('datetime64[D]')
+        rows = np.flatnonzero(days == np.datetime64(selected_date, 'D'))
         
-        if daily_data.empty:
+        if len(rows) == 0:
             return go.Figure()
         
         # Convert time to polar coordinates
-        daily_data['hour_angle'] = (daily_data['time_decimal'] / 24) * 360
-        daily_data['radius'] = daily_data['height']
+        hour_angle = df['time_decimal'].to_numpy()[rows] * (360 / 24)
+        radius = df['height'].to_numpy(dtype=np.float32)[rows]
         
         fig = go.Figure()
         
-        # Add radial tide pattern
-        fig.add_trace(go.Scatterpolar(
-            r=daily_data['radius'],
-            theta=daily_data['hour_angle'],
-            mode='lines+markers',
-            line=dict(color='rgba(103, 183, 220, 0.8)', width=3),
-            marker=dict(size=8, color=daily_data['height'], 
-                       colorscale='Viridis', showscale=True),
-            fill='toself',
-            fillcolor='rgba(74, 144, 226, 0.3)',
-            name='Tide Pattern',
-            hovertemplate='<b>Time:</b> %{theta:.0f}°<br><b>Height:</b> %{r:.2f}m<extra></extra>'
-        ))
-        
-        fig.update_layout(
-            title=f'🕐 Daily Tide Clock - {selected_date}',
-            polar=dict(
-                bgcolor=self.theme['bg_color'],
-                radialaxis=dict(
-                    visible=True,
-                    color=self.theme['font_color'],
-                    gridcolor=self.theme['grid_color']
-                ),
-                angularaxis=dict(
-                    color=self.theme['font_color'],
-                    gridcolor=self.theme['grid_color'],
-                    tickmode='array',
-                    tickvals=[0, 90, 180, 270],
-                    ticktext=['12AM', '6AM', '12PM', '6PM']
+        with fig.batch_update():
+            # Add radial tide pattern
+            fig.add_trace(go.Scatterpolar(
+                r=radius,
+                theta=hour_angle,
+                mode='lines+markers',
+                line=dict(color='rgba(103, 183, 220, 0.8)', width=3),
+                marker=dict(size=8, color=radius, 
+                           colorscale='Viridis', showscale=True),
+                fill='toself',
+                fillcolor='rgba(74, 144, 226, 0.3)',
+                name='Tide Pattern',
+                hovertemplate='<b>Time:</b> %{theta:.0f}°<br><b>Height:</b> %{r:.2f}m<extra></extra>'
+            ))
+            
+            fig.update_layout(
+                self._base_layout,
+                title=f'🕐 Daily Tide Clock - {selected_date}',
+                polar=dict(
+                    bgcolor=self.theme['bg_color'],
+                    radialaxis=dict(
+                        visible=True,
+                        color=self.theme['font_color'],
+                        gridcolor=self.theme['grid_color']
+                    ),
+                    angularaxis=dict(
+                        color=self.theme['font_color'],
+                        gridcolor=self.theme['grid_color'],
+                        tickmode='array',
+                        tickvals=[0, 90, 180, 270],
+                        ticktext=['12AM', '6AM', '12PM', '6PM']
+                    )
                 )
-            ),
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            font=dict(color=self.theme['font_color'])
-        )
+            )
         
         return fig
     
     def create_seasonal_heatmap(self, df):
         """Create seasonal tide height heatmap"""
         # Aggregate data by day of year and hour
-        df['day_of_year'] = df['datetime'].dt.dayofyear
-        df['hour'] = df['datetime'].dt.hour
-        
-        pivot_data = df.groupby(['day_of_year', 'hour'])['height'].mean().unstack(fill_value=0)
+        pivot_values, days, hours = self._cached_day_hour_mean(df)
         
         fig = go.Figure(data=go.Heatmap(
-            z=pivot_data.values,
-            x=list(range(24)),
-            y=pivot_data.index,
+            z=pivot_values,
+            x=hours,
+            y=days,
             colorscale='Viridis',
             hoverongaps=False,
             hovertemplate='<b>Day:</b> %{y}<br><b>Hour:</b> %{x}<br><b>Avg Height:</b> %{z:.2f}m<extra></extra>'
         ))
         
         fig.update_layout(
+            self._base_layout,
             title='📅 Seasonal Tide Patterns (Day vs Hour)',
             xaxis=dict(
                 title='Hour of Day',
@@ -293,10 +379,7 @@ class TideVisualizer:
             yaxis=dict(
                 title='Day of Year',
                 color=self.theme['font_color']
-            ),
-            plot_bgcolor=self.theme['bg_color'],
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            font=dict(color=self.theme['font_color'])
+            )
         )
         
         return fig
@@ -304,22 +387,18 @@ class TideVisualizer:
     def create_3d_tide_surface(self, df):
         """Create 3D surface plot of tide patterns"""
         # Prepare data for 3D visualization
-        df_copy = df.copy()
-        df_copy['day_of_year'] = df_copy['datetime'].dt.dayofyear
-        df_copy['hour'] = df_copy['datetime'].dt.hour
-        
-        # Create pivot table
-        surface_data = df_copy.groupby(['day_of_year', 'hour'])['height'].mean().unstack(fill_value=0)
+        surface_values, days, hours = self._cached_day_hour_mean(df)
         
         fig = go.Figure(data=[go.Surface(
-            z=surface_data.values,
-            x=list(range(24)),
-            y=surface_data.index,
+            z=surface_values,
+            x=hours,
+            y=days,
             colorscale='Viridis',
             hovertemplate='<b>Day:</b> %{y}<br><b>Hour:</b> %{x}<br><b>Height:</b> %{z:.2f}m<extra></extra>'
         )])
         
         fig.update_layout(
+            self._base_layout,
             title='🏔️ 3D Tide Surface - Annual Patterns',
             scene=dict(
                 xaxis_title='Hour of Day',
@@ -329,9 +408,7 @@ class TideVisualizer:
                 xaxis=dict(color=self.theme['font_color']),
                 yaxis=dict(color=self.theme['font_color']),
                 zaxis=dict(color=self.theme['font_color'])
-            ),
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            font=dict(color=self.theme['font_color'])
+            )
         )
         
         return fig
@@ -341,10 +418,19 @@ class TideVisualizer:
         freqs = harmonic_data['fft_freqs']
         power = harmonic_data['power_spectrum']
         
-        # Only plot positive frequencies
-        positive_freq_mask = freqs > 0
-        freqs_pos = freqs[positive_freq_mask]
-        power_pos = power[positive_freq_mask]
+        # Only plot positive frequencies; the rfft grid ascends from the DC bin,
+        # so they are a suffix and both arrays can be sliced as views
+        first_positive = np.searchsorted(freqs, 0, side='right')
+        freqs_pos = freqs[first_positive:]
+        power_pos = power[first_positive:]
+        
+        # Dominant frequencies
+        dominant_freqs = harmonic_data['frequencies'][harmonic_data['frequencies'] > 0]
+        
+        # Nearest spectrum bin for each frequency (freqs_pos is ascending); ties go left
+        idx = np.clip(np.searchsorted(freqs_pos, dominant_freqs), 1, len(freqs_pos) - 1)
+        idx -= (dominant_freqs - freqs_pos[idx - 1]) <= (freqs_pos[idx] - dominant_freqs)
+        dominant_power = power_pos[idx]
         
         fig = make_subplots(
             rows=2, cols=1,
@@ -352,70 +438,62 @@ class TideVisualizer:
             vertical_spacing=0.1
         )
         
-        # Power spectrum
-        fig.add_trace(
-            go.Scatter(
+        # Power spectrum over dominant harmonics, added to their rows in one call
+        traces = [
+            dict(
+                type='scatter',
                 x=freqs_pos,
                 y=power_pos,
                 mode='lines',
                 line=dict(color=self.colors['wave'], width=2),
                 name='Power Spectrum'
             ),
-            row=1, col=1
-        )
-        
-        # Dominant frequencies
-        dominant_freqs = harmonic_data['frequencies'][harmonic_data['frequencies'] > 0]
-        dominant_power = [power_pos[np.argmin(np.abs(freqs_pos - f))] for f in dominant_freqs]
-        
-        fig.add_trace(
-            go.Bar(
+            dict(
+                type='bar',
                 x=dominant_freqs,
                 y=dominant_power,
                 marker_color=self.colors['high'],
                 name='Dominant Harmonics'
-            ),
-            row=2, col=1
-        )
+            )
+        ]
         
-        fig.update_layout(
-            title='🎵 Tidal Harmonic Analysis',
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            plot_bgcolor=self.theme['bg_color'],
-            font=dict(color=self.theme['font_color']),
-            showlegend=False
-        )
+        with fig.batch_update():
+            fig.add_traces(traces, rows=[1, 2], cols=[1, 1])
+            
+            fig.update_layout(
+                self._base_layout,
+                title='🎵 Tidal Harmonic Analysis',
+                showlegend=False
+            )
         
         return fig
     
     def create_monthly_comparison(self, df):
         """Create monthly tide comparison violin plot"""
-        fig = go.Figure()
-        
-        months = df['month'].unique()
-        month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
-                      'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
-        
-        for month in sorted(months):
-            month_data = df[df['month'] == month]['height']
-            
-            fig.add_trace(go.Violin(
-                y=month_data,
-                x=[month_names[month-1]] * len(month_data),
-                name=month_names[month-1],
-                box_visible=True,
-                meanline_visible=True,
-                fillcolor=f'rgba({74 + month * 10}, {144 + month * 5}, {226 - month * 5}, 0.6)',
-                line_color=self.theme['font_color']
-            ))
+        month_names = np.array(['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun',
+                                'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec'])
+        months = df['month'].to_numpy()
+        
+        # One violin trace split by month label; plotly groups it per x category
+        fig = go.Figure(go.Violin(
+            y=df['height'].to_numpy(),
+            x=np.take(month_names, months - 1),
+            name='Tide Height',
+            box_visible=True,
+            meanline_visible=True,
+            fillcolor='rgba(74, 144, 226, 0.6)',
+            line_color=self.theme['font_color']
+        ))
         
         fig.update_layout(
+            self._base_layout,
             title='📊 Monthly Tide Height Distribution',
-            xaxis_title='Month',
+            xaxis=dict(
+                title='Month',
+                categoryorder='array',
+                categoryarray=month_names[np.unique(months) - 1]
+            ),
             yaxis_title='Tide Height (m)',
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            plot_bgcolor=self.theme['bg_color'],
-            font=dict(color=self.theme['font_color']),
             showlegend=False
         )
         
@@ -423,15 +501,17 @@ class TideVisualizer:
     
     def create_tide_range_analysis(self, df):
         """Create tidal range analysis"""
-        # Calculate daily tidal ranges
-        daily_stats = df.groupby(df['datetime'].dt.date).agg({
-            'height': ['min', 'max', 'mean', 'std']
-        }).round(2)
-        
-        daily_stats.columns = ['min_height', 'max_height', 'avg_height', 'std_height']
-        daily_stats['tidal_range'] = daily_stats['max_height'] - daily_stats['min_height']
-        daily_stats.reset_index(inplace=True)
-        daily_stats.columns = ['date'] + list(daily_stats.columns[1:])
+        # Calculate daily tidal ranges, grouping the bare heights by calendar day
+        days = df['datetime'].to_numpy().astype('datetime64[D]')
+        daily = pd.Series(df['height'].to_numpy(dtype=np.float64)).groupby(days).agg(
+            ['min', 'max', 'mean', 'std']
+        ).round(2)
+        
+        # Plain arrays for the traces, heights as float32
+        dates = daily.index.to_numpy()
+        tidal_range = (daily['max'].to_numpy() - daily['min'].to_numpy()).astype(np.float32)
+        avg_height = daily['mean'].to_numpy(dtype=np.float32)
+        std_height = daily['std'].to_numpy(dtype=np.float32)
         
         fig = make_subplots(
             rows=2, cols=1,
@@ -439,11 +519,12 @@ class TideVisualizer:
             vertical_spacing=0.15
         )
         
-        # Tidal range plot
-        fig.add_trace(
-            go.Scatter(
-                x=daily_stats['date'],
-                y=daily_stats['tidal_range'],
+        # Tidal range over average heights with error bars, added to their rows in one call
+        traces = [
+            dict(
+                type='scatter',
+                x=dates,
+                y=tidal_range,
                 mode='lines+markers',
                 line=dict(color=self.colors['wave'], width=2),
                 marker=dict(size=4),
@@ -451,34 +532,30 @@ class TideVisualizer:
                 fill='tonexty',
                 fillcolor='rgba(74, 144, 226, 0.3)'
             ),
-            row=1, col=1
-        )
-        
-        # Average heights with error bars
-        fig.add_trace(
-            go.Scatter(
-                x=daily_stats['date'],
-                y=daily_stats['avg_height'],
+            dict(
+                type='scatter',
+                x=dates,
+                y=avg_height,
                 error_y=dict(
                     type='data',
-                    array=daily_stats['std_height'],
+                    array=std_height,
                     visible=True
                 ),
                 mode='lines+markers',
                 line=dict(color=self.colors['high'], width=2),
                 marker=dict(size=4),
                 name='Average Height'
-            ),
-            row=2, col=1
-        )
+            )
+        ]
         
-        fig.update_layout(
-            title='📏 Tidal Range Analysis',
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            plot_bgcolor=self.theme['bg_color'],
-            font=dict(color=self.theme['font_color']),
-            showlegend=False
-        )
+        with fig.batch_update():
+            fig.add_traces(traces, rows=[1, 2], cols=[1, 1])
+            
+            fig.update_layout(
+                self._base_layout,
+                title='📏 Tidal Range Analysis',
+                showlegend=False
+            )
         
         return fig
     
@@ -506,8 +583,7 @@ class TideVisualizer:
         ))
         
         fig.update_layout(
-            paper_bgcolor=self.theme['paper_bgcolor'],
-            font=dict(color=self.theme['font_color']),
+            self._base_layout,
             height=400
         )
         
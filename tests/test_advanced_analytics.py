@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from advanced_analytics import AdvancedTideAnalytics
+
+
+@pytest.fixture
+def tide_frame():
+    """Two weeks of hourly heights with alternating high/low rows and one missing height"""
+    datetimes = pd.date_range('2023-01-01', periods=24 * 14, freq='h')
+    rng = np.random.default_rng(0)
+    heights = 1.5 + np.sin(np.arange(len(datetimes)) / 2) + rng.normal(0, 0.1, len(datetimes))
+    heights[37] = np.nan
+    return pd.DataFrame({
+        'datetime': datetimes,
+        'height': heights,
+        'tide_type': np.where(np.arange(len(datetimes)) % 2 == 0, 'high', 'low'),
+        'hour': datetimes.hour,
+        'month': datetimes.month,
+        'is_weekend': datetimes.dayofweek >= 5,
+    })
+
+
+def test_tidal_statistics_skip_missing_height(tide_frame):
+    stats = AdvancedTideAnalytics().calculate_tidal_statistics(tide_frame)
+    height = tide_frame['height']
+    
+    expected_basic = {
+        'mean': height.mean(),
+        'median': height.median(),
+        'std': height.std(),
+        'min': height.min(),
+        'max': height.max(),
+        'range': height.max() - height.min(),
+        'skewness': height.skew(),
+        'kurtosis': height.kurtosis(),
+    }
+    assert stats['basic'] == pytest.approx(expected_basic)
+    
+    by_type = height.groupby(tide_frame['tide_type'])
+    cycles = stats['tidal_cycles']
+    assert cycles['avg_high_tide'] == pytest.approx(by_type.mean()['high'])
+    assert cycles['avg_low_tide'] == pytest.approx(by_type.mean()['low'])
+    assert cycles['low_tide_std'] == pytest.approx(by_type.std()['low'])
+    
+    temporal = stats['temporal']
+    assert temporal['hourly_avg'] == pytest.approx(height.groupby(tide_frame['hour']).mean().to_dict())
+    assert temporal['monthly_avg'] == pytest.approx(height.groupby(tide_frame['month']).mean().to_dict())
+    assert temporal['weekend_avg'] == pytest.approx(height[tide_frame['is_weekend']].mean())
+    assert temporal['weekday_avg'] == pytest.approx(height[~tide_frame['is_weekend']].mean())